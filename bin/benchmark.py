@@ -0,0 +1,399 @@
+"""
+# Developer tool measuring the rendering performance of &..matrix.
+
+# Renders independent pages serially and then concurrently from a thread pool
+# where each worker uses the thread's &..matrix.Type.local replica.
+# On free-threaded builds of Python, the concurrent pass should show a real speedup;
+# when the GIL is enabled, the ratio is expected to be near or below one.
+
+# Cursor motion patterns are measured by the number of bytes produced by absolute
+# positioning and by &..matrix.Context.motion.
+
+# The workload suite renders sequences of frames representing common applications
+# with full redraws, &..matrix.Context.print, and differential updates, &..frame.Renderer.
+# The bytes emitted, SGR transitions, wall time, and allocations of each method are
+# reported and, when a path is given, written as JSON for comparison between releases.
+"""
+import sys
+import re
+import json
+import time
+import platform
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from .. import core
+from .. import matrix
+from .. import frame
+
+def gil_enabled() -> bool:
+	"""
+	# Whether the running interpreter is serializing threads with a global lock.
+	"""
+	try:
+		return sys._is_gil_enabled()
+	except AttributeError:
+		return True
+
+def workload_page(seed:int, width=120, height=48, Phrase=core.Phrase) -> core.Page:
+	"""
+	# Construct a page of styled phrases whose content is derived from &seed.
+	"""
+	bold = core.Traits.construct('bold')
+	notraits = core.NoTraits
+	words = []
+	page = []
+
+	for lineno in range(height):
+		del words[:]
+		cells = 0
+		i = seed + lineno
+		while cells < width - 16:
+			text = "w%d.%d" %(i, cells)
+			color = (i * 0x010203) & 0xFFFFFF
+			words.append((text, color, -1024, bold if i % 3 == 0 else notraits))
+			words.append((" ", -1024, -1024, notraits))
+			cells += len(text) + 1
+			i += 7
+		page.append(Phrase.construct(words))
+
+	return page
+
+def render_page(ttype:matrix.Type, page:core.Page, width=120) -> int:
+	"""
+	# Print the &page using a new &matrix.Context and return the number of bytes produced.
+	"""
+	ctx = matrix.Context(ttype)
+	ctx.context_set_position((0, 0))
+	ctx.context_set_dimensions((width, len(page)))
+	return sum(map(len, ctx.print(page, [x.cellcount() for x in page])))
+
+def measure_parallel(threads=4, pages=64, iterations=4, ttype=matrix.utf8_terminal_type):
+	"""
+	# Render &pages workloads serially and then using &threads workers.
+
+	# [ Returns ]
+	# Dictionary containing the elapsed times and the speedup of the parallel pass.
+	"""
+	workload = [workload_page(i) for i in range(pages)]
+	draw = (lambda page: render_page(ttype.local(), page))
+
+	start = time.perf_counter()
+	for i in range(iterations):
+		serial_bytes = sum(map(draw, workload))
+	serial = time.perf_counter() - start
+
+	with ThreadPoolExecutor(threads) as tp:
+		# Warm the replicas before measuring.
+		list(tp.map(draw, workload[:threads]))
+
+		start = time.perf_counter()
+		for i in range(iterations):
+			parallel_bytes = sum(tp.map(draw, workload))
+		parallel = time.perf_counter() - start
+
+	assert serial_bytes == parallel_bytes
+
+	return {
+		'gil': gil_enabled(),
+		'threads': threads,
+		'pages': pages,
+		'iterations': iterations,
+		'bytes': serial_bytes,
+		'serial': serial,
+		'parallel': parallel,
+		'speedup': serial / parallel,
+	}
+
+def editor_motions(width=120, height=48, count=1024):
+	"""
+	# Generate the cursor motions of an editor session as (origin, point) pairs.
+
+	# Typing advances the cursor by a cell, and navigation moves to adjacent lines,
+	# the start and end of lines, and by pages.
+	"""
+	x, y = 0, 0
+	for i in range(count):
+		k = i % 16
+		if k < 8:
+			point = (min(x + 1, width - 1), y)
+		elif k < 11:
+			point = (x, min(y + 1, height - 1))
+		elif k == 11:
+			point = (x, max(y - 1, 0))
+		elif k == 12:
+			point = (0, y)
+		elif k == 13:
+			point = ((i * 37) % width, y)
+		elif k == 14:
+			point = (x, (y + height // 2) % height)
+		else:
+			point = (x - 1 if x else 0, y)
+		yield (x, y), point
+		x, y = point
+
+def log_motions(width=120, height=48, count=1024):
+	"""
+	# Generate the cursor motions of a log viewer as (origin, point) pairs.
+
+	# Lines of varying length are written below the previous line, and a status
+	# field on the last line is updated after every few lines.
+	"""
+	y = 0
+	for i in range(count):
+		end = 20 + ((i * 53) % (width - 20))
+		yield (0, y), (end, y)
+		if i % 4 == 3:
+			yield (end, y), (width - 10, height - 1)
+			yield (width - 4, height - 1), (0, (y + 1) % (height - 1))
+		else:
+			yield (end, y), (0, (y + 1) % (height - 1))
+		y = (y + 1) % (height - 1)
+
+def measure_motion(width=120, height=48, ttype=matrix.utf8_terminal_type):
+	"""
+	# Count the bytes used by absolute positioning and planned motions for the patterns.
+
+	# [ Returns ]
+	# Dictionary containing the byte counts of each pattern.
+	"""
+	ctx = matrix.Context(ttype)
+	ctx.context_set_position((0, 0))
+	ctx.context_set_dimensions((width, height))
+
+	r = {}
+	for name, pattern in (('editor', editor_motions), ('log', log_motions)):
+		motions = list(pattern(width, height))
+		absolute = sum(len(ctx.seek_absolute(p)) for o, p in motions)
+		planned = sum(len(ctx.motion(o, p)) for o, p in motions)
+		r[name + '-motions'] = len(motions)
+		r[name + '-absolute-bytes'] = absolute
+		r[name + '-planned-bytes'] = planned
+		r[name + '-ratio'] = planned / absolute
+	return r
+
+def _phrase(words, Phrase=core.Phrase, normal=core.NoTraits):
+	# Construct a phrase from (text, textcolor) pairs or (text, textcolor, traits) triples.
+	return Phrase.construct(
+		(w[0], w[1], -1024, w[2] if len(w) > 2 else normal)
+		for w in words
+	)
+
+def text_frames(width=120, height=48, count=32):
+	"""
+	# Generate full screens of unstyled prose where every line changes between frames.
+	"""
+	vocabulary = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit"]
+	n = len(vocabulary)
+
+	for f in range(count):
+		page = []
+		for lineno in range(height):
+			words = []
+			cells = 0
+			i = f * 3 + lineno * 5
+			while True:
+				w = vocabulary[i % n]
+				if cells + len(w) + 1 > width:
+					break
+				words.append(w)
+				cells += len(w) + 1
+				i += 1
+			page.append(_phrase([(' '.join(words), -1024)]))
+		yield page
+
+def syntax_frames(width=120, height=48, count=32):
+	"""
+	# Generate the frames of source code with syntax highlighting scrolled one line at a time.
+	"""
+	bold = core.Traits.construct('bold')
+	italic = core.Traits.construct('italic')
+	keyword, name, literal, comment = 0x569cd6, 0xdcdcaa, 0xce9178, 0x6a9955
+
+	source = []
+	for i in range(height + count):
+		k = i % 6
+		if k == 0:
+			line = [("def", keyword, bold), (" ", -1024), ("function_%d" %(i,), name), ("(x, y):", -1024)]
+		elif k == 5:
+			line = [("\t# Comment describing line %d." %(i,), comment, italic)]
+		elif k == 4:
+			line = [("\t", -1024), ("return", keyword, bold), (" x + ", -1024), (str(i), literal)]
+		else:
+			line = [
+				("\tv%d = " %(i,), -1024),
+				("call", name), ("(", -1024),
+				("'string %d'" %(i,), literal),
+				(", x)", -1024),
+			]
+		source.append(_phrase(line))
+
+	for f in range(count):
+		yield source[f:f+height]
+
+def log_frames(width=120, height=48, count=32):
+	"""
+	# Generate the frames of a log viewer appending a line per frame above a status line.
+	"""
+	levels = [("INFO", 0x00aa00), ("WARNING", 0xaaaa00), ("ERROR", 0xaa0000), ("DEBUG", 0x888888)]
+	lines = []
+	for i in range(height + count):
+		level, color = levels[(i * 7) % 11 % len(levels)]
+		message = "request %d completed in %d ms" %(i * 31, (i * 17) % 997)
+		lines.append(_phrase([
+			("%06d " %(i,), 0x888888),
+			(level.ljust(8), color),
+			(message[:width - 15], -1024),
+		]))
+
+	for f in range(count):
+		status = _phrase([("lines: %d" %(f + height - 1,), 0xffffff, core.Traits.construct('inverse'))])
+		yield lines[f:f+height-1] + [status]
+
+def table_frames(width=120, height=48, count=32):
+	"""
+	# Generate the frames of a table whose numeric cells are updated in place.
+	"""
+	columns = max(1, width // 12)
+	header = _phrase([("column %-4d" %(c,), 0xffffff, core.Traits.construct('underline')) for c in range(columns)])
+
+	for f in range(count):
+		page = [header]
+		for r in range(height - 1):
+			row = []
+			for c in range(columns):
+				value = (r * 131 + c * 17 + (f if (r + c) % 5 == 0 else 0)) % 100000
+				row.append(("%10d  " %(value,), 0xaa0000 if value % 7 == 0 else -1024))
+			page.append(_phrase(row))
+		yield page
+
+def wide_frames(width=120, height=48, count=32):
+	"""
+	# Generate the frames of text containing wide characters with lines changing between frames.
+	"""
+	glyphs = "謝了春紅太匆匆無奈朝來寒雨晚來風"
+	n = len(glyphs)
+
+	for f in range(count):
+		page = []
+		for lineno in range(height):
+			i = lineno + (f if lineno % 3 == 0 else 0)
+			text = ''.join(glyphs[(i + k) % n] for k in range((width - 8) // 2))
+			page.append(_phrase([("%4d" %(lineno,), 0x888888), (" ", -1024), (text, 0x00aaaa)]))
+		yield page
+
+workloads = {
+	'text': text_frames,
+	'syntax': syntax_frames,
+	'log': log_frames,
+	'table': table_frames,
+	'wide': wide_frames,
+}
+
+def print_method(screen:matrix.Screen):
+	"""
+	# Construct a function drawing entire pages using &matrix.Context.print.
+	"""
+	def draw(page):
+		cellcounts = [x.cellcount() for x in page]
+		return screen.seek_first() + b''.join(screen.print(page, cellcounts))
+	return draw
+
+def frame_method(screen:matrix.Screen):
+	"""
+	# Construct a function drawing the differences between pages using &frame.Renderer.
+	"""
+	return frame.Renderer(screen).frame
+
+methods = {
+	'print': print_method,
+	'frame': frame_method,
+}
+
+def count_transitions(data:bytes, sgr=re.compile(rb'\x1b\[[0-9;:]*m')) -> int:
+	"""
+	# Count the SGR sequences in &data.
+	"""
+	return len(sgr.findall(data))
+
+def measure_workload(frames, method, width=120, height=48, ttype=matrix.utf8_terminal_type):
+	"""
+	# Draw &frames with a new screen using &method.
+
+	# The frames are drawn twice; once for timing and once while tracing allocations.
+
+	# [ Returns ]
+	# Dictionary containing the bytes emitted, the number of SGR transitions,
+	# the elapsed time, and the peak and retained allocations.
+	"""
+	def screen():
+		s = matrix.Screen(ttype.replicate())
+		s.context_set_dimensions((width, height))
+		return s
+
+	draw = method(screen())
+	start = time.perf_counter()
+	output = [draw(page) for page in frames]
+	elapsed = time.perf_counter() - start
+
+	draw = method(screen())
+	tracemalloc.start()
+	try:
+		baseline = tracemalloc.get_traced_memory()[0]
+		for page in frames:
+			draw(page)
+		retained, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+
+	data = b''.join(output)
+	return {
+		'frames': len(frames),
+		'bytes': len(data),
+		'sgr-transitions': count_transitions(data),
+		'time': elapsed,
+		'allocation-peak': peak - baseline,
+		'allocation-retained': retained - baseline,
+	}
+
+def measure_suite(width=120, height=48, count=32, ttype=matrix.utf8_terminal_type):
+	"""
+	# Measure every method against every workload.
+
+	# [ Returns ]
+	# Dictionary mapping workload names to dictionaries mapping method names
+	# to the results of &measure_workload.
+	"""
+	r = {}
+	for name, generate in workloads.items():
+		frames = list(generate(width, height, count))
+		r[name] = {
+			m: measure_workload(frames, method, width, height, ttype)
+			for m, method in methods.items()
+		}
+	return r
+
+def main(inv=sys.argv[1:]):
+	threads = int(inv[0]) if inv else 4
+	r = measure_parallel(threads=threads)
+	r.update(measure_motion())
+	for k, v in r.items():
+		sys.stdout.write("%s: %r\n" %(k, v))
+
+	suite = measure_suite()
+	for workload, results in suite.items():
+		for m, v in results.items():
+			sys.stdout.write("%s-%s: %r\n" %(workload, m, v))
+
+	if len(inv) > 1:
+		with open(inv[1], 'w') as f:
+			json.dump({
+				'python': platform.python_version(),
+				'implementation': platform.python_implementation(),
+				'gil': gil_enabled(),
+				'parallel': r,
+				'workloads': suite,
+			}, f, indent=1)
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,237 @@
+"""
+# Composition of overlapping &.matrix.Context areas onto a &.matrix.Screen.
+
+# &Compositor owns the screen and holds a &Layer for every context. Layers are stacked by
+# their order, and the rows of the screen are composed from the visible cell ranges of each
+# layer. Only the rows affected by changed layers are composed again, and the composed rows
+# are given to a &.frame.Renderer so that only the visible cells that changed are emitted.
+"""
+import typing
+
+from . import core
+from . import matrix
+from . import frame
+
+def crop(phrase:core.Phrase, cellcount:int, start:int, stop:int, substitute=(lambda x: ' ')) -> core.Phrase:
+	"""
+	# Select the cells from &start to &stop of &phrase.
+
+	# Wide characters torn by the range are replaced using &substitute.
+	# The result is shorter than the range when &phrase is.
+	"""
+	if start >= cellcount or start >= stop:
+		return phrase.__class__(())
+
+	if stop < cellcount:
+		phrase = phrase.rstripcells(cellcount - stop, substitute)
+	if start:
+		phrase = phrase.lstripcells(start, substitute)
+	return phrase
+
+class Layer(object):
+	"""
+	# A &matrix.Context and the page displayed in its area.
+
+	# [ Properties ]
+	# /context/
+		# The context designating the area of the layer.
+	# /order/
+		# The position of the layer in the stack; higher orders occlude lower orders.
+	# /visible/
+		# Whether the layer is composed.
+	# /page/
+		# The phrases of each line of the area.
+	# /cellcounts/
+		# The cell counts of the &page phrases.
+	"""
+
+	def __init__(self, context:matrix.Context, order:int):
+		self.context = context
+		self.order = order
+		self.visible = True
+		self.page = []
+		self.cellcounts = []
+		self.area = self.measure()
+
+	def measure(self) -> typing.Tuple[int, int, int, int]:
+		"""
+		# The horizontal and vertical position, width, and height of the context's area.
+		"""
+		x, y = self.context.point
+		width, height = self.context.dimensions
+		return (x, y, width, height)
+
+	def cells(self, lineno:int, start:int, stop:int) -> typing.Sequence[core.Words]:
+		"""
+		# The words occupying the cells from &start to &stop of the line &lineno.
+
+		# Cells not covered by the line's phrase are filled with spaces using the
+		# context's configured colors so that lower layers are occluded.
+		"""
+		if lineno < len(self.page):
+			words = list(crop(self.page[lineno], self.cellcounts[lineno], start, stop))
+		else:
+			words = []
+
+		used = sum(w[0] for w in words)
+		if used < stop - start:
+			n = stop - start - used
+			words.append((n, ' ' * n, self.context._context_traits))
+		return words
+
+class Compositor(object):
+	"""
+	# Stack of &Layer instances composed onto a &matrix.Screen.
+
+	# [ Properties ]
+	# /screen/
+		# The screen that the layers are composed onto.
+	# /renderer/
+		# The &frame.Renderer receiving the composed rows.
+	# /layers/
+		# The layers ordered from the lowest to the highest.
+	"""
+
+	def __init__(self, screen:matrix.Screen, Renderer=frame.Renderer):
+		self.screen = screen
+		self.renderer = Renderer(screen)
+		self.layers = []
+		self._rows = []
+		self._dirty = set()
+		self.invalidate()
+
+	def invalidate(self):
+		"""
+		# Compose every row and redraw the screen with the next frame.
+		"""
+		self._rows = [self.screen.Phrase(())] * self.screen.height
+		self._dirty = set(range(self.screen.height))
+		self.renderer.invalidate()
+
+	def _damage(self, area, start=0, stop=None):
+		# Mark the rows of the &area from &start to &stop dirty.
+		x, y, width, height = area
+		if stop is None:
+			stop = height
+		self._dirty.update(range(max(0, y + start), min(y + min(stop, height), len(self._rows))))
+
+	def insert(self, context:matrix.Context, order:int=0) -> Layer:
+		"""
+		# Create a &Layer for &context and add it to the stack.
+
+		# Layers with equal orders are stacked in the order that they were inserted.
+		"""
+		layer = Layer(context, order)
+		i = len(self.layers)
+		while i and self.layers[i-1].order > order:
+			i -= 1
+		self.layers.insert(i, layer)
+		self._damage(layer.area)
+		return layer
+
+	def remove(self, layer:Layer):
+		"""
+		# Remove &layer from the stack; the layers below are composed in its place.
+		"""
+		self.layers.remove(layer)
+		self._damage(layer.area)
+
+	def update(self, layer:Layer, page:core.Page, cellcounts:typing.Sequence[int]=None):
+		"""
+		# Replace the page of &layer; only the rows of changed lines are composed again.
+		"""
+		page = list(page)
+		if cellcounts is None:
+			cellcounts = [x.cellcount() for x in page]
+		else:
+			cellcounts = list(cellcounts)
+
+		former = layer.page
+		for i in range(max(len(former), len(page))):
+			a = former[i] if i < len(former) else None
+			b = page[i] if i < len(page) else None
+			if a is not b and a != b:
+				self._damage(layer.area, i, i+1)
+
+		layer.page = page
+		layer.cellcounts = cellcounts
+
+	def move(self, layer:Layer, point=None, dimensions=None):
+		"""
+		# Change the position or dimensions of &layer's context.
+		"""
+		self._damage(layer.area)
+		if point is not None:
+			layer.context.context_set_position(point)
+		if dimensions is not None:
+			layer.context.context_set_dimensions(dimensions)
+		layer.area = layer.measure()
+		self._damage(layer.area)
+
+	def set_visible(self, layer:Layer, visible:bool):
+		"""
+		# Show or hide &layer.
+		"""
+		if layer.visible != visible:
+			layer.visible = visible
+			self._damage(layer.area)
+
+	def compose(self, row:int) -> core.Phrase:
+		"""
+		# Construct the phrase displayed on the screen's &row.
+
+		# Layers are visited from the highest order, and each contributes the cells of its
+		# area that are not covered by a higher layer. Cells without a layer, and trailing blanks in the
+		# screen's configured colors, are left to be cleared by the renderer.
+		"""
+		screen = self.screen
+		normal = screen._context_traits
+		uncovered = [(0, screen.width)]
+		pieces = []
+
+		for layer in reversed(self.layers):
+			if not layer.visible:
+				continue
+			x, y, width, height = layer.area
+			if not (y <= row < y + height):
+				continue
+
+			right = x + width
+			remaining = []
+			for start, stop in uncovered:
+				lo = max(start, x)
+				hi = min(stop, right)
+				if lo >= hi:
+					remaining.append((start, stop))
+					continue
+
+				pieces.append((lo, layer.cells(row - y, lo - x, hi - x)))
+				if start < lo:
+					remaining.append((start, lo))
+				if hi < stop:
+					remaining.append((hi, stop))
+
+			uncovered = remaining
+			if not uncovered:
+				break
+
+		for start, stop in uncovered:
+			pieces.append((start, [(stop - start, ' ' * (stop - start), normal)]))
+		pieces.sort(key=(lambda x: x[0]))
+
+		words = [w for start, piece in pieces for w in piece if w[0] or w[1]]
+		while words and words[-1][2] == normal and not str(words[-1][1]).strip(' '):
+			del words[-1]
+
+		return screen.Phrase(words)
+
+	def frame(self) -> bytes:
+		"""
+		# Compose the dirty rows and construct the sequences updating the screen.
+		"""
+		rows = self._rows
+		for row in sorted(self._dirty):
+			rows[row] = self.compose(row)
+		self._dirty.clear()
+
+		return self.renderer.frame(rows)
@@ -57,6 +57,8 @@
 	# Control an effect of typing input into the terminal.
 # /log/
 	# Control the terminal's internal logging facility.
+# /synchronized-output/
+	# Defer painting the screen until the mode is reset; used to present frames atomically.
 
 # [ Configuration Types ]
 
@@ -72,6 +74,8 @@
 # /observe/
 	# Configuration used by &.bin.observe to maximize the perceived events.
 """
+import weakref
+
 from . import matrix
 
 private_mode_options = {
@@ -100,6 +104,18 @@ private_mode_options = {
 	'scroll-bar': 30,
 	'scroll-bottom-on-output': 1010,
 	'scroll-bottom-on-input': 1011,
+
+	# Synchronized Updates; contour, kitty, wezterm, foot, iterm2, and others.
+	'synchronized-output': 2026,
+}
+
+# Private mode states reported in response to DECRQM.
+private_mode_states = {
+	0: 'not-recognized',
+	1: 'set',
+	2: 'reset',
+	3: 'permanently-set',
+	4: 'permanently-reset',
 }
 
 def configuration(ttype, settings, options=private_mode_options) -> bytes:
@@ -172,17 +188,87 @@ ctypes = {
 	'prepared': (None, None, (), ()),
 }
 
-def _terminal_ctl_exit(tty, ctype, write, restoration, limit=64):
+def query_private_mode(ttydevice, option:str, timeout:float=0.2,
+		ttype:matrix.Type=matrix.utf8_terminal_type,
+		options=private_mode_options, states=private_mode_states,
+	) -> str:
+	"""
+	# Request the state of the private mode identified by the &option symbol using DECRQM
+	# and wait, at most, &timeout seconds for the terminal's report.
+
+	# The terminal device should be in a raw mode and no input should be pending as
+	# any data read before the report is discarded.
+
+	# [ Returns ]
+	# The state from &private_mode_states or &None if the terminal did not respond.
+	"""
+	import os
+	import re
+	import select
+	import time
+
+	code = options[option]
+	report = re.compile(rb'\x1b\[\?' + str(code).encode('ascii') + rb';(\d+)\$y')
+	fd = ttydevice.fileno()
+	os.write(fd, ttype.decrqm(code))
+
+	data = b''
+	deadline = time.monotonic() + timeout
+	while True:
+		remaining = deadline - time.monotonic()
+		if remaining <= 0 or not select.select((fd,), (), (), remaining)[0]:
+			return None
+
+		data += os.read(fd, 512)
+		m = report.search(data)
+		if m is not None:
+			return states.get(int(m.group(1)), 'not-recognized')
+
+# Results of &synchronized_output by device path and, for devices without paths, device object.
+_synchronized_output_support = {}
+_synchronized_output_devices = weakref.WeakKeyDictionary()
+
+def synchronized_output(ttydevice, timeout:float=0.2,
+		ttype:matrix.Type=matrix.utf8_terminal_type,
+		refresh:bool=False,
+	) -> bool:
+	"""
+	# Whether the terminal supports the (id)`synchronized-output` private mode.
+
+	# The terminal is queried using &query_private_mode once per device path, or once per
+	# device object when the device has no (id)`path`; subsequent calls return the cached
+	# result. The result is normally given to &matrix.Screen.context_set_synchronized.
+
+	# [ Parameters ]
+	# /refresh/
+		# Query the terminal and replace the cached result. Paths may be reused by another
+		# terminal after the device is closed, so the result should be refreshed when
+		# the path is opened again.
+	"""
+	path = getattr(ttydevice, 'path', None)
+	if path:
+		cache, key = _synchronized_output_support, path
+	else:
+		cache, key = _synchronized_output_devices, ttydevice
+
+	if not refresh:
+		try:
+			return cache[key]
+		except KeyError:
+			pass
+
+	state = query_private_mode(ttydevice, 'synchronized-output', timeout=timeout, ttype=ttype)
+	supported = cache[key] = state in {'set', 'reset', 'permanently-set'}
+	return supported
+
+def _terminal_ctl_exit(tty, ctype, sink, restoration, limit=64):
 	# Usually called by &setup via atexit
 	issue_warning = False
 	try:
-		file = tty.fileno()
-		while restoration and limit > 0:
-			restoration = restoration[write(file, restoration):]
-			limit -= 1
-		else:
-			if limit <= 0:
-				issue_warning = True
+		sink.write(restoration)
+		sink.flush(limit)
+		if len(sink):
+			issue_warning = True
 
 		# No-op if mode is None.
 		tty.restore() # fault.system.tty.Device instance
@@ -195,17 +281,15 @@ def _terminal_ctl_exit(tty, ctype, write, restoration, limit=64):
 			message = "(tty) terminal configuration may be incoherent"
 			sys.stderr.write("\n\r[!* WARNING: %s]\n\r" %(message,))
 
-def _terminal_ctl_init(tty, ctype, mode, write, preparation, limit=64):
+def _terminal_ctl_init(tty, ctype, mode, sink, preparation, limit=64):
 	if mode is not None:
 		init_dev = getattr(tty, 'set_' + mode) # set_raw, normally
 		init_dev()
 
-	file = tty.fileno()
-	while preparation and limit > 0:
-		preparation = preparation[write(file, preparation):]
-		limit -= 1
+	sink.write(preparation)
+	sink.flush(limit)
 
-	if limit <= 0 and preparation:
+	if len(sink):
 		# Didn't finish writing?
 		pass
 
@@ -215,6 +299,7 @@ def setup(
 		destruct=False,
 		ttydevice=None,
 		atprepare=b'', atrestore=b'', limit=64,
+		sink=None,
 	):
 	"""
 	# Construct a device instance and functions for preparing the terminal and
@@ -246,6 +331,13 @@ def setup(
 		# Additional binary string to write to the terminal device at preparation.
 	# /atrestore/
 		# Additional binary string to write to the terminal device at restoration.
+	# /limit/
+		# The maximum number of system calls to use when writing the preparation
+		# or restoration sequences.
+	# /sink/
+		# The &.output.Sink instance used to write the preparation and restoration sequences.
+		# If &None, one is created for &ttydevice. Applications rendering frames with a &.output.Sink
+		# should provide it here so that pending output is written in order.
 
 	# [ Returns ]
 	# A tuple:
@@ -255,13 +347,16 @@ def setup(
 	# The two callables can be used for applications supporting suspend operations.
 	"""
 	import functools
-	from os import write
 
 	if ttydevice is None:
 		from ..system.tty import Device
 		ttydevice = Device.open()
 	ttydevice.record()
 
+	if sink is None:
+		from .output import Sink
+		sink = Sink(ttydevice.fileno())
+
 	undomode, s, r, saves, restores = configuration(ttype, ctypes[ctype])
 	init = saves + s + r + ttype.wm(22,0) + atprepare
 
@@ -272,10 +367,10 @@ def setup(
 	restoration = undo + restores + ttype.wm_title('') + ttype.wm(23, 0)
 	restoration += atrestore
 
-	restore = functools.partial(_terminal_ctl_exit, ttydevice, ctype, write, restoration, limit=limit)
+	restore = functools.partial(_terminal_ctl_exit, ttydevice, ctype, sink, restoration, limit=limit)
 
 	imode = ctypes[ctype][1]
-	prepare = functools.partial(_terminal_ctl_init, ttydevice, ctype, imode, write, init, limit=limit)
+	prepare = functools.partial(_terminal_ctl_init, ttydevice, ctype, imode, sink, init, limit=limit)
 
 	if destruct is True:
 		import sys
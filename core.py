@@ -6,6 +6,11 @@
 	# &Phrase sequence.
 # /&Text/
 	# Alias to the builtin &str.
+
+# [ Control Characters ]
+# Control characters in the text of words are displayed using replacement glyphs,
+# &control_mapping, so that they cannot affect the terminal's state. &cells counts the
+# cells of the glyphs, and is the default measure used by the &Phrase methods.
 """
 import typing
 import functools
@@ -14,6 +19,24 @@ from ..system import text
 
 Text = str
 
+# Replacement glyphs for the control characters of words.
+# C0 and DEL use their Control Pictures; C1 has no pictures and uses the substitute symbol.
+control_mapping = {chr(i): chr(0x2400 + i) for i in range(32)}
+control_mapping['\x7f'] = '\u2421'
+control_mapping.update((chr(i), '\u2426') for i in range(0x80, 0xa0))
+control_table = str.maketrans(control_mapping)
+
+def cells(string, table=control_table, cells=text.cells, str=str, isprintable=str.isprintable) -> int:
+	"""
+	# Count the cells occupied by &string when it is rendered.
+
+	# Control characters are counted as the cell of their replacement glyph.
+	"""
+	string = str(string)
+	if isprintable(string):
+		return cells(string)
+	return cells(string.translate(table))
+
 class Point(tuple):
 	"""
 	# A pair of integers locating a cell on the screen.
@@ -331,7 +354,7 @@ class RenderParameters(tuple):
 			traits if traits is not None else self[2],
 		))
 
-	def form(self, *strings, cells=text.cells):
+	def form(self, *strings, cells=cells):
 		"""
 		# Construct words suitable for use by &Phrase associated with the parameters, &self.
 		"""
@@ -363,7 +386,7 @@ class Units(tuple):
 	def __add__(self, rhs):
 		return self.__class__(super().__add__(rhs))
 
-def grapheme(text, index, cells=text.cells, slice=slice, Units=Units, str=str):
+def grapheme(text, index, cells=cells, slice=slice, Units=Units, str=str):
 	"""
 	# Retrieve the slice to characters that make up an indivisible unit of cells.
 	# This is not always consistent with User Perceived Characters.
@@ -457,7 +480,7 @@ class Phrase(tuple):
 	def construct(Class,
 			specifications:typing.Sequence[object],
 			RenderParametersConstructor=RenderParameters,
-			cells=text.cells, str=str
+			cells=cells, str=str
 		):
 		"""
 		# Create a &Phrase instance from the &specifications designating
@@ -504,7 +527,7 @@ class Phrase(tuple):
 		"""
 		return sum(len(x[1]) for x in self)
 
-	def translate(self, *indexes, iter=iter, len=len, next=next, cells=text.cells):
+	def translate(self, *indexes, iter=iter, len=len, next=next, cells=cells):
 		"""
 		# Get the cell offsets of the given character indexes.
 
@@ -581,7 +604,7 @@ class Phrase(tuple):
 
 		return self.__class__(self.select(start, stop, adjust))
 
-	def select(self, start, stop, adjust=(lambda x: x), cells=text.cells):
+	def select(self, start, stop, adjust=(lambda x: x), cells=cells):
 		"""
 		# Extract the subphrase at the given indexes.
 
@@ -619,7 +642,7 @@ class Phrase(tuple):
 	def lfindcell(self,
 			celloffset:int, start=(0,0,0),
 			map=map, len=len, range=range,
-			cells=text.cells, islice=itertools.islice
+			cells=cells, islice=itertools.islice
 		):
 		"""
 		# Find the word and character index using a cell offset.
@@ -687,7 +710,7 @@ class Phrase(tuple):
 	def rfindcell(self,
 			celloffset:int, start=(-1,0,0),
 			map=map, len=len, range=range,
-			cells=text.cells, islice=itertools.islice
+			cells=cells, islice=itertools.islice
 		):
 		"""
 		# Find the word and character index using a cell offset.
@@ -745,7 +768,7 @@ class Phrase(tuple):
 	def lstripcells(self,
 			cellcount:int, substitute=(lambda x: '*'),
 			list=list, len=len, range=range,
-			cells=text.cells
+			cells=cells
 		):
 		"""
 		# Remove the given number of cells from the start of the phrase.
@@ -779,7 +802,7 @@ class Phrase(tuple):
 	def rstripcells(self,
 			cellcount:int, substitute=(lambda x: '*'),
 			list=list, len=len, range=range,
-			cells=text.cells
+			cells=cells
 		):
 		"""
 		# Remove the given number of cells from the end of the phrase.
@@ -812,5 +835,180 @@ class Phrase(tuple):
 
 		return self.__class__(out)
 
+	def fit(self,
+			width:int, ellipsis:str='\u2026', align:str='left', padding:RenderParameters=None,
+			list=list, len=len, cells=cells
+		):
+		"""
+		# Truncate or pad the phrase so that it occupies exactly &width cells.
+
+		# The words are scanned once. When the phrase exceeds &width, it is cut at the
+		# cell offset that leaves room for &ellipsis, and the &ellipsis word is appended using
+		# the properties of the word that was cut. A wide character torn by the cut is
+		# replaced with spaces. When the phrase is shorter than &width, space words are
+		# added according to &align.
+
+		# [ Parameters ]
+		# /width/
+			# The number of cells that the new phrase must occupy.
+		# /ellipsis/
+			# The text used to indicate truncation. Omitted if wider than &width.
+		# /align/
+			# One of `'left'`, `'right'`, or `'center'` designating the position
+			# of the phrase within the padding.
+		# /padding/
+			# The &RenderParameters of the padding words. Defaults to the parameters
+			# of the adjacent word without its traits.
+		"""
+		ecells = cells(ellipsis) if ellipsis else 0
+		if ecells > width:
+			ellipsis = ''
+			ecells = 0
+		limit = width - ecells
+
+		total = 0
+		cut = None
+		for i, word in enumerate(self):
+			c = word[0]
+			if cut is None and total + c > limit:
+				cut = (i, total)
+			total += c
+			if total > width:
+				break
+		else:
+			if total == width:
+				return self
+			return self._pad(width - total, align, padding)
+
+		# Truncate; cut is always set as limit <= width.
+		i, used = cut
+		out = list(self[:i])
+		c, itext, rp = self[i][:3]
+
+		remainder = limit - used
+		used = index = 0
+		for unit in itext:
+			c = cells(unit)
+			if used + c > remainder:
+				break
+			used += c
+			index += 1
+
+		if index:
+			out.append((used, itext[:index], rp))
+		if used < remainder:
+			# Torn or empty; fill with spaces.
+			out.append((remainder - used, ' ' * (remainder - used), rp))
+		if ellipsis:
+			out.append((ecells, ellipsis, rp))
+
+		return self.__class__(out)
+
+	def _pad(self, count, align, padding, Parameters=RenderParameters):
+		if not self:
+			rp = padding or Parameters((-1024, -1024, NoTraits))
+			return self.__class__(((count, ' ' * count, rp),))
+
+		if align == 'left':
+			left = 0
+		elif align == 'right':
+			left = count
+		elif align == 'center':
+			left = count // 2
+		else:
+			raise ValueError("unknown alignment: " + repr(align))
+		right = count - left
+
+		out = list(self)
+		if left:
+			rp = padding or Parameters((self[0][2][0], self[0][2][1], NoTraits))
+			out.insert(0, (left, ' ' * left, rp))
+		if right:
+			rp = padding or Parameters((self[-1][2][0], self[-1][2][1], NoTraits))
+			out.append((right, ' ' * right, rp))
+
+		return self.__class__(out)
+
+class PhraseBuilder(object):
+	"""
+	# Mutable accumulator for constructing a &Phrase from individual words.
+
+	# Adjacent words with identical &RenderParameters are merged as they are appended, and
+	# the cell count of the phrase is maintained as words are added. The text of a merged
+	# run is joined once when the run ends, and &freeze performs the only copy of the words.
+
+	# [ Properties ]
+	# /cellcount/
+		# The number of cells that the phrase will occupy.
+	"""
+	__slots__ = ('Phrase', 'cellcount', '_words', '_run', '_run_cells', '_run_rparams')
+
+	def __init__(self, Phrase=Phrase):
+		self.Phrase = Phrase
+		self.cellcount = 0
+		self._words = []
+		self._run = []
+		self._run_cells = 0
+		self._run_rparams = None
+
+	def __len__(self):
+		"""
+		# The number of words that &freeze will produce.
+		"""
+		return len(self._words) + (1 if self._run else 0)
+
+	def _flush(self):
+		run = self._run
+		if run:
+			self._words.append((self._run_cells, run[0] if len(run) == 1 else ''.join(run), self._run_rparams))
+			self._run = []
+		self._run_cells = 0
+		self._run_rparams = None
+
+	def append(self, word:Words, str=str):
+		"""
+		# Add the &word to the end of the phrase.
+		"""
+		cells, itext, rp = word[:3]
+		self.cellcount += cells
+
+		if type(itext) is not str:
+			# Units and other types are not merged.
+			self._flush()
+			self._words.append(word)
+		elif rp == self._run_rparams:
+			self._run.append(itext)
+			self._run_cells += cells
+		else:
+			self._flush()
+			self._run.append(itext)
+			self._run_cells = cells
+			self._run_rparams = rp
+
+		return self
+
+	def extend(self, words:typing.Iterable[Words]):
+		"""
+		# Add all the &words to the end of the phrase.
+		"""
+		for x in words:
+			self.append(x)
+		return self
+
+	def add(self, itext:Text, rparams:RenderParameters, cells=cells):
+		"""
+		# Add a word with the given text and properties; the cells are calculated.
+		"""
+		return self.append((cells(itext), itext, rparams))
+
+	def freeze(self) -> Phrase:
+		"""
+		# Construct the &Phrase from the words added to the builder.
+
+		# The builder remains usable and may continue to be extended.
+		"""
+		self._flush()
+		return self.Phrase(self._words)
+
 # Common descriptor endpoint.
 Page = typing.Sequence[Phrase]
@@ -0,0 +1,504 @@
+"""
+# Headless terminal model for verifying the output of &.matrix and &.frame.
+
+# &Emulator interprets the subset of control sequences produced by &.matrix.Type,
+# &.matrix.Context, and &.matrix.Screen, and maintains the resulting grid of cells with
+# their styles, the cursor, and the scrolling region. It is not a complete emulator;
+# sequences outside of the subset are recorded in &Emulator.unrecognized.
+
+# [ Cells ]
+
+# The &Emulator.grid is a list of rows where each row is a list of cells. Cells are pairs
+# consisting of the text and the style. The second cell of a wide character holds an empty string,
+# and combining characters are appended to the text of the cell that they follow.
+
+# Styles are triples of the text color, the cell color, and the &frozenset of trait names used by
+# &.matrix.Type.style_codes. Colors are &None for the terminal's default, or tuples
+# identifying the palette and index: `('tty-16', 1)`, `('xterm-256', 196)`, or `('rgb', 255, 0, 0)`.
+"""
+import codecs
+import typing
+
+from ..system import text
+
+Style = typing.Tuple[object, object, typing.FrozenSet[str]]
+normal = (None, None, frozenset())
+
+# SGR trait codes; see &.matrix.Type.style_codes.
+trait_enters = {
+	1: 'bold',
+	2: 'feint',
+	3: 'italic',
+	4: 'underline',
+	5: 'blink',
+	6: 'rapid',
+	7: 'inverse',
+	8: 'invisible',
+	9: 'cross',
+	21: 'double-underline',
+	51: 'frame',
+	52: 'encircle',
+	53: 'overline',
+}
+
+trait_exits = {
+	22: ('bold', 'feint'),
+	23: ('italic',),
+	24: ('underline', 'double-underline'),
+	25: ('blink', 'rapid'),
+	27: ('inverse',),
+	28: ('invisible',),
+	29: ('cross',),
+	54: ('frame', 'encircle'),
+	55: ('overline',),
+}
+
+# Private modes interpreted by the emulator.
+_pm_origin = 6
+_pm_autowrap = 7
+_pm_screen = 1049
+
+class Emulator(object):
+	"""
+	# Grid of cells updated by the sequences given to &feed.
+
+	# [ Properties ]
+	# /width/
+		# The number of columns.
+	# /height/
+		# The number of rows.
+	# /grid/
+		# The rows of cells; see &[Cells].
+	# /cursor/
+		# The column and row of the cursor.
+	# /style/
+		# The style applied to written characters.
+	# /region/
+		# The first and last rows of the scrolling region.
+	# /modes/
+		# The private modes that have been set or reset.
+	# /title/
+		# The last title set by an OSC.
+	# /responses/
+		# The bytes that the terminal would have sent in response to requests.
+	# /unrecognized/
+		# The sequences that were not interpreted.
+	"""
+
+	def __init__(self, width:int, height:int, encoding:str='utf-8', cells=text.cells):
+		self.width = width
+		self.height = height
+		self.encoding = encoding
+		self.cells = cells
+		self._decoder = codecs.getincrementaldecoder(encoding)('surrogateescape')
+		self._input = ''
+		self.responses = []
+		self.unrecognized = []
+		self.reset()
+
+	def reset(self):
+		"""
+		# Restore the initial state; clear the grid and reset the modes and cursor.
+		"""
+		self.grid = [self._line() for i in range(self.height)]
+		self.cursor = (0, 0)
+		self.style = normal
+		self.region = (0, self.height - 1)
+		self.modes = {_pm_autowrap: True, 25: True}
+		self.title = None
+		self._pending = False
+		self._saved = None
+		self._alternate = None
+		self._last = None
+
+	def _line(self, style=normal):
+		return [(' ', style)] * self.width
+
+	def _blank(self):
+		# Erased cells use the current cell color.
+		return (' ', (None, self.style[1], frozenset()))
+
+	def text(self) -> typing.Sequence[str]:
+		"""
+		# The text of each row.
+		"""
+		return [''.join(c[0] for c in row) for row in self.grid]
+
+	def feed(self, data:bytes):
+		"""
+		# Interpret &data; incomplete sequences are retained until the next call.
+		"""
+		self._input += self._decoder.decode(data)
+		string = self._input
+		i = 0
+		n = len(string)
+
+		while i < n:
+			ch = string[i]
+			if ch == '\x1b':
+				end = self._escape(string, i)
+				if end is None:
+					break
+				i = end
+			elif ch < ' ' or ch == '\x7f':
+				self._control(ch)
+				i += 1
+			else:
+				self._put(ch)
+				i += 1
+
+		self._input = string[i:]
+
+	# Character interpretation.
+
+	def _tear(self, y, start, stop):
+		# Clear the halves of wide characters crossing the edges of the range.
+		row = self.grid[y]
+		if 0 < start < self.width and row[start][0] == '':
+			row[start-1] = (' ', row[start-1][1])
+		if 0 < stop < self.width and row[stop][0] == '':
+			row[stop] = (' ', row[stop][1])
+
+	def _put(self, ch):
+		x, y = self.cursor
+		w = self.cells(ch)
+
+		if w == 0:
+			# Combining; attach to the last written cell.
+			px = x if self._pending else x - 1
+			if px >= 0:
+				row = self.grid[y]
+				if row[px][0] == '' and px > 0:
+					px -= 1
+				row[px] = (row[px][0] + ch, row[px][1])
+			return
+
+		autowrap = self.modes.get(_pm_autowrap, False)
+		if self._pending or x + w > self.width:
+			if autowrap:
+				if not self._pending:
+					# Wide character at the last column.
+					self.grid[y][x] = self._blank()
+				x = 0
+				y = self._index(y)
+			else:
+				x = self.width - w
+		self._pending = False
+
+		self._tear(y, x, x + w)
+		row = self.grid[y]
+		row[x] = (ch, self.style)
+		if w == 2:
+			row[x+1] = ('', self.style)
+		self._last = ch
+
+		x += w
+		if x >= self.width:
+			x = self.width - 1
+			self._pending = autowrap
+		self.cursor = (x, y)
+
+	def _index(self, y):
+		# Move down a line scrolling the region when at its bottom.
+		top, bottom = self.region
+		if y == bottom:
+			self._scroll(1)
+		elif y < self.height - 1:
+			y += 1
+		return y
+
+	def _control(self, ch):
+		x, y = self.cursor
+		self._pending = False
+		if ch == '\r':
+			self.cursor = (0, y)
+		elif ch in '\n\x0b\x0c':
+			self.cursor = (x, self._index(y))
+		elif ch == '\x08':
+			self.cursor = (max(x - 1, 0), y)
+		elif ch == '\t':
+			self.cursor = (min(((x // 8) + 1) * 8, self.width - 1), y)
+		elif ch == '\x07':
+			pass
+		else:
+			self.unrecognized.append(ch)
+
+	def _escape(self, string, i):
+		# Interpret the escape sequence at &i; returns the index following the sequence.
+		if i + 1 >= len(string):
+			return None
+
+		kind = string[i+1]
+		if kind == '[':
+			j = i + 2
+			while j < len(string) and not ('\x40' <= string[j] <= '\x7e'):
+				j += 1
+			if j >= len(string):
+				return None
+			self._csi(string[i+2:j], string[j])
+			return j + 1
+		elif kind == ']':
+			bel = string.find('\x07', i + 2)
+			st = string.find('\x1b\\', i + 2)
+			if bel == -1 and st == -1:
+				return None
+			if st == -1 or (bel != -1 and bel < st):
+				self._osc(string[i+2:bel])
+				return bel + 1
+			else:
+				self._osc(string[i+2:st])
+				return st + 2
+
+		x, y = self.cursor
+		if kind == '7':
+			self._saved = (self.cursor, self.style)
+		elif kind == '8':
+			self._restore()
+		elif kind == 'M':
+			top, bottom = self.region
+			if y == top:
+				self._scroll(-1)
+			elif y > 0:
+				self.cursor = (x, y - 1)
+		elif kind == 'D':
+			self.cursor = (x, self._index(y))
+		elif kind == 'E':
+			self.cursor = (0, self._index(y))
+		elif kind == 'c':
+			self.reset()
+		else:
+			self.unrecognized.append(string[i:i+2])
+		self._pending = False
+		return i + 2
+
+	def _osc(self, content):
+		code, _, value = content.partition(';')
+		if code in ('0', '2'):
+			self.title = value
+		else:
+			self.unrecognized.append('\x1b]' + content)
+
+	def _restore(self):
+		if self._saved is not None:
+			self.cursor, style = self._saved
+			if style is not None:
+				self.style = style
+
+	# Control sequences.
+
+	def _csi(self, parameters, final):
+		private = parameters[:1] == '?'
+		if private:
+			parameters = parameters[1:]
+
+		intermediates = ''
+		while parameters and parameters[-1] in ' !"#$%&\'()*+,-./':
+			intermediates = parameters[-1] + intermediates
+			parameters = parameters[:-1]
+
+		try:
+			params = [int(x) if x else None for x in parameters.split(';')] if parameters else []
+		except ValueError:
+			self.unrecognized.append('\x1b[' + parameters + intermediates + final)
+			return
+
+		def p(index, default=1):
+			if index < len(params) and params[index]:
+				return params[index]
+			return default
+
+		x, y = self.cursor
+		width = self.width
+		height = self.height
+		top, bottom = self.region
+		key = ('?' if private else '') + intermediates + final
+
+		# Only motions and edits leave the pending wrap state.
+		if key not in ('b', 'm', '?h', '?l', 'n', '?$p', 't'):
+			self._pending = False
+
+		if key in ('H', 'f'):
+			row = p(0) - 1
+			col = p(1) - 1
+			if self.modes.get(_pm_origin):
+				row = min(row + top, bottom)
+			self.cursor = (min(col, width - 1), min(row, height - 1))
+		elif key == 'A':
+			limit = top if y >= top else 0
+			self.cursor = (x, max(y - p(0), limit))
+		elif key == 'B':
+			limit = bottom if y <= bottom else height - 1
+			self.cursor = (x, min(y + p(0), limit))
+		elif key == 'C':
+			self.cursor = (min(x + p(0), width - 1), y)
+		elif key == 'D':
+			self.cursor = (max(x - p(0), 0), y)
+		elif key == 'E':
+			limit = bottom if y <= bottom else height - 1
+			self.cursor = (0, min(y + p(0), limit))
+		elif key == 'F':
+			limit = top if y >= top else 0
+			self.cursor = (0, max(y - p(0), limit))
+		elif key in ('G', '`'):
+			self.cursor = (min(p(0) - 1, width - 1), y)
+		elif key == 'd':
+			self.cursor = (x, min(p(0) - 1, height - 1))
+		elif key == 'X':
+			stop = min(x + p(0), width)
+			self._tear(y, x, stop)
+			self.grid[y][x:stop] = [self._blank()] * (stop - x)
+		elif key == 'K':
+			mode = p(0, 0)
+			start, stop = {0: (x, width), 1: (0, x + 1), 2: (0, width)}.get(mode, (x, x))
+			self._tear(y, start, stop)
+			self.grid[y][start:stop] = [self._blank()] * (stop - start)
+		elif key == 'J':
+			mode = p(0, 0)
+			blank = self._blank()
+			if mode == 0:
+				self._tear(y, x, width)
+				self.grid[y][x:] = [blank] * (width - x)
+				rows = range(y + 1, height)
+			elif mode == 1:
+				self._tear(y, 0, x + 1)
+				self.grid[y][:x+1] = [blank] * (x + 1)
+				rows = range(0, y)
+			else:
+				rows = range(0, height)
+			for r in rows:
+				self.grid[r] = [blank] * width
+		elif key == 'b':
+			if self._last is not None:
+				for i in range(p(0)):
+					self._put(self._last)
+		elif key == '@':
+			n = min(p(0), width - x)
+			row = self.grid[y]
+			self._tear(y, x, x)
+			row[x:] = ([self._blank()] * n) + row[x:width-n]
+			if row[-1][0] != '' and self.cells(row[-1][0][:1] or ' ') == 2:
+				row[-1] = (' ', row[-1][1])
+		elif key == 'P':
+			n = min(p(0), width - x)
+			row = self.grid[y]
+			self._tear(y, x, x + n)
+			row[x:] = row[x+n:] + ([self._blank()] * n)
+		elif key in ('L', 'M'):
+			if top <= y <= bottom:
+				n = min(p(0), bottom - y + 1)
+				lines = self.grid[y:bottom+1]
+				blank = [self._line((None, self.style[1], frozenset())) for i in range(n)]
+				if key == 'L':
+					lines = blank + lines[:len(lines)-n]
+				else:
+					lines = lines[n:] + blank
+				self.grid[y:bottom+1] = lines
+				self.cursor = (0, y)
+		elif key == 'S':
+			self._scroll(p(0))
+		elif key == 'T':
+			self._scroll(-p(0))
+		elif key == 'r':
+			t = p(0) - 1
+			b = p(1, height) - 1
+			if t < b < height:
+				self.region = (t, b)
+				self.cursor = (0, t if self.modes.get(_pm_origin) else 0)
+		elif key == 'm':
+			self._sgr(params or [0])
+		elif key in ('?h', '?l'):
+			for option in params:
+				self._mode(option, key == '?h')
+		elif key == 's':
+			self._saved = (self.cursor, None)
+		elif key == 'u':
+			self._restore()
+		elif key == 'n':
+			if p(0, 0) == 6:
+				self.responses.append(('\x1b[%d;%dR' %(y + 1, x + 1)).encode('ascii'))
+			elif p(0, 0) == 5:
+				self.responses.append(b'\x1b[0n')
+		elif key == '?$p':
+			option = p(0, 0)
+			state = 0 if option not in self.modes else (1 if self.modes[option] else 2)
+			self.responses.append(('\x1b[?%d;%d$y' %(option, state)).encode('ascii'))
+		elif key == '!p':
+			self.style = normal
+			self.region = (0, height - 1)
+			self.modes[_pm_origin] = False
+			self.modes[_pm_autowrap] = True
+			self.modes[25] = True
+		elif key == 't':
+			pass
+		else:
+			self.unrecognized.append('\x1b[' + ('?' if private else '') + parameters + intermediates + final)
+
+	def _scroll(self, count):
+		# Scroll the region up by &count lines; negative counts scroll down.
+		top, bottom = self.region
+		n = min(abs(count), bottom - top + 1)
+		lines = self.grid[top:bottom+1]
+		blank = [self._line((None, self.style[1], frozenset())) for i in range(n)]
+		if count > 0:
+			lines = lines[n:] + blank
+		else:
+			lines = blank + lines[:len(lines)-n]
+		self.grid[top:bottom+1] = lines
+
+	def _mode(self, option, state):
+		self.modes[option] = state
+		if option == _pm_origin:
+			self.cursor = (0, self.region[0] if state else 0)
+		elif option == _pm_screen:
+			if state and self._alternate is None:
+				self._alternate = (self.grid, self.cursor, self.style)
+				self.grid = [self._line() for i in range(self.height)]
+			elif not state and self._alternate is not None:
+				self.grid, self.cursor, self.style = self._alternate
+				self._alternate = None
+
+	def _sgr(self, params):
+		fg, bg, traits = self.style
+		traits = set(traits)
+		i = 0
+		while i < len(params):
+			code = params[i] or 0
+			if code == 0:
+				fg = bg = None
+				traits.clear()
+			elif code in trait_enters:
+				traits.add(trait_enters[code])
+			elif code in trait_exits:
+				traits.difference_update(trait_exits[code])
+			elif 30 <= code <= 37:
+				fg = ('tty-16', code - 30)
+			elif 90 <= code <= 97:
+				fg = ('tty-16', code - 90 + 8)
+			elif 40 <= code <= 47:
+				bg = ('tty-16', code - 40)
+			elif 100 <= code <= 107:
+				bg = ('tty-16', code - 100 + 8)
+			elif code == 39:
+				fg = None
+			elif code == 49:
+				bg = None
+			elif code in (38, 48):
+				kind = params[i+1] if i + 1 < len(params) else None
+				if kind == 5:
+					color = ('xterm-256', params[i+2] or 0)
+					i += 2
+				elif kind == 2:
+					color = ('rgb',) + tuple(x or 0 for x in params[i+2:i+5])
+					i += 4
+				else:
+					color = None
+					i = len(params)
+				if code == 38:
+					fg = color
+				else:
+					bg = color
+			else:
+				self.unrecognized.append('SGR %d' %(code,))
+			i += 1
+
+		self.style = (fg, bg, frozenset(traits))
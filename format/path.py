@@ -131,7 +131,7 @@ def f_route_absolute(route, warning=False):
 	return prefix + f_route_path(root, route.container) + f_route_identifier(route, warning=warning)
 
 if __name__ == '__main__':
-	import sys, itertools
+	import sys
 	from ...system import files as sysfiles
 	from .. import matrix
 	screen = matrix.Screen()
@@ -140,11 +140,9 @@ if __name__ == '__main__':
 	rp = screen.terminal_type.normal_render_parameters
 	for x in values:
 		r = sysfiles.Path.from_path(x)
-		phrase = screen.Phrase.from_words(
-			itertools.chain.from_iterable(
-				rp.apply(textcolor=color).form(s)
-				for s, color in f_route_absolute(r)
-			)
-		)
+		pb = screen.PhraseBuilder()
+		for s, color in f_route_absolute(r):
+			pb.add(s, rp.apply(textcolor=color))
+		phrase = pb.freeze()
 		sys.stderr.buffer.write(b''.join(screen.render(phrase)) + screen.reset_text())
 		sys.stderr.write("\n")
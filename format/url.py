@@ -45,19 +45,17 @@ def f_string(string):
 	return f_struct(ri.parse(string))
 
 if __name__ == '__main__':
-	import sys, itertools
+	import sys
 	from .. import matrix
 	screen = matrix.Screen()
 	values = sys.argv[1:] # ri, path, ts, dir: libformat dir /
 
 	rp = screen.terminal_type.normal_render_parameters
 	for x in values:
-		ph = screen.Phrase.from_words(
-			itertools.chain.from_iterable(
-				rp.apply(textcolor=color).form(s)
-				for s, color in f_string(x)
-			)
-		)
+		pb = screen.PhraseBuilder()
+		for s, color in f_string(x):
+			pb.add(s, rp.apply(textcolor=color))
+		ph = pb.freeze()
 		sys.stderr.buffer.write(
 			b''.join(screen.render(ph)) + b'\n'
 		)
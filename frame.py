@@ -0,0 +1,622 @@
+"""
+# Frame rendering for &.matrix.Screen instances.
+
+# &Renderer maintains a shadow of the page last presented on the screen and compares
+# new frames against it in order to emit only the sequences necessary to update
+# the changed cells.
+
+# &Scheduler coalesces redraw requests so that frames are constructed no more often than
+# the terminal can display them.
+"""
+import time
+import typing
+import collections
+
+from . import core
+from . import matrix
+
+def prefix(former:core.Phrase, latter:core.Phrase, cells=matrix.cells, str=str, zip=zip):
+	"""
+	# Identify the cells shared by the start of &former and &latter.
+
+	# [ Returns ]
+	# A pair consisting of the number of common cells and the word and character
+	# index of the first differing character in &latter. The character index never
+	# refers to a zero width character so that combinations are redrawn with their base.
+	"""
+	offset = 0
+	i = 0
+
+	for i, (a, b) in enumerate(zip(former, latter)):
+		if a == b:
+			offset += b[0]
+			continue
+
+		if a[2] != b[2]:
+			return offset, (i, 0)
+
+		at = a[1]
+		bt = b[1]
+		k = 0
+		for x, y in zip(at, bt):
+			if x != y:
+				break
+			k += 1
+
+		while k > 0 and (
+				(k < len(bt) and cells(str(bt[k])) == 0) or
+				(k < len(at) and cells(str(at[k])) == 0)
+			):
+			k -= 1
+
+		return offset + cells(str(bt[:k])), (i, k)
+	else:
+		n = min(len(former), len(latter))
+		return offset, (n, 0)
+
+def suffix(former:core.Phrase, latter:core.Phrase, limit:int, cells=matrix.cells, str=str, zip=zip):
+	"""
+	# Identify the cells shared by the end of &former and &latter up to &limit cells.
+
+	# [ Returns ]
+	# A pair consisting of the number of common cells and the word and character
+	# index in &latter where the common cells begin.
+	"""
+	offset = 0
+	nwords = len(latter)
+	i = nwords
+
+	for a, b in zip(reversed(former), reversed(latter)):
+		if a == b and offset + b[0] <= limit:
+			offset += b[0]
+			i -= 1
+			continue
+
+		if a[2] != b[2]:
+			break
+
+		at = a[1]
+		bt = b[1]
+		k = 0
+		for x, y in zip(reversed(at), reversed(bt)):
+			if x != y:
+				break
+			k += 1
+
+		# Suffixes must start on a character with cells and not exceed the limit.
+		while k > 0 and (
+				cells(str(bt[len(bt)-k])) == 0 or
+				cells(str(at[len(at)-k])) == 0 or
+				offset + cells(str(bt[len(bt)-k:])) > limit
+			):
+			k -= 1
+
+		if k:
+			return offset + cells(str(bt[len(bt)-k:])), (i-1, len(bt)-k)
+		break
+
+	return offset, (i, 0)
+
+def segment(phrase:core.Phrase, start, stop, cells=matrix.cells, str=str):
+	"""
+	# Construct the words of &phrase between the &start and &stop word and character indexes.
+	"""
+	si, sc = start
+	ei, ec = stop
+
+	if si == ei:
+		if sc < ec:
+			c, t, rp = phrase[si][:3]
+			t = t[sc:ec]
+			yield (cells(str(t)), t, rp)
+		return
+
+	if si < len(phrase):
+		c, t, rp = phrase[si][:3]
+		if sc:
+			t = t[sc:]
+			c = cells(str(t))
+		if t:
+			yield (c, t, rp)
+
+	yield from phrase[si+1:ei]
+
+	if ec and ei < len(phrase):
+		c, t, rp = phrase[ei][:3]
+		t = t[:ec]
+		yield (cells(str(t)), t, rp)
+
+def shift(former:core.Page, latter:core.Page, limit=8):
+	"""
+	# Identify the vertical displacement of lines from &former to &latter.
+
+	# Lines of &latter vote for the offsets at which they appear in &former; empty lines
+	# and lines appearing more than &limit times do not vote. The longest contiguous run
+	# of lines matching at the most popular offset is selected.
+
+	# [ Returns ]
+	# &None or a triple consisting of the offset, and the first and last lines of the
+	# run in &latter. A positive offset means that the lines moved up;
+	# `latter[i] == former[i + offset]` for the lines in the run.
+	"""
+	positions = {}
+	for j, x in enumerate(former):
+		if x:
+			l = positions.setdefault(x, [])
+			if len(l) <= limit:
+				l.append(j)
+
+	votes = {}
+	for i, x in enumerate(latter):
+		l = positions.get(x)
+		if l is not None and len(l) <= limit:
+			for j in l:
+				if j != i:
+					votes[j - i] = votes.get(j - i, 0) + 1
+
+	if not votes:
+		return None
+
+	offset = max(votes, key=votes.__getitem__)
+
+	# Longest run at the offset.
+	best = None
+	start = None
+	nformer = len(former)
+	for i in range(len(latter) + 1):
+		j = i + offset
+		if i < len(latter) and 0 <= j < nformer and latter[i] == former[j]:
+			if start is None:
+				start = i
+		elif start is not None:
+			if best is None or (i - start) > (best[1] - best[0] + 1):
+				best = (start, i - 1)
+			start = None
+
+	if best is None:
+		return None
+	return (offset,) + best
+
+def overwrite(phrase:core.Phrase, position, count:int, rparams:core.RenderParameters, cells=matrix.cells, str=str):
+	"""
+	# Identify the text of the &count cells preceding the word and character index &position
+	# of &phrase.
+
+	# [ Returns ]
+	# The text, or &None when the cells are not drawn with &rparams or a wide
+	# character is torn.
+	"""
+	i, k = position
+	characters = []
+	n = 0
+
+	while n < count:
+		if k == 0:
+			i -= 1
+			if i < 0:
+				return None
+			k = len(phrase[i][1])
+			continue
+
+		if phrase[i][2] != rparams:
+			return None
+		k -= 1
+		c = str(phrase[i][1][k])
+		characters.append(c)
+		n += cells(c)
+
+	if n != count:
+		return None
+	return ''.join(reversed(characters))
+
+def update(context:matrix.Context, buffer:bytearray, lineno:int,
+		former:core.Phrase, former_cells:int,
+		latter:core.Phrase, latter_cells:int,
+		rparams:core.RenderParameters, cursor=None, limit=4,
+	):
+	"""
+	# Append the sequences transforming the line &lineno of &context from &former to &latter
+	# to &buffer.
+
+	# Only the cells between the common prefix and suffix of the phrases are drawn. When the
+	# change is a pure insertion or deletion and the area extends to the terminal's
+	# &matrix.Context.right_edge, the unchanged tail is shifted using ICH or DCH rather than
+	# redrawn. The cells after &former_cells are presumed to be clear.
+
+	# When the cursor is a few cells before the change, the unchanged cells may be
+	# written again instead of moving the cursor; see &overwrite and &matrix.Context.motion.
+
+	# [ Parameters ]
+	# /rparams/
+		# The render parameters in effect before the sequences.
+	# /cursor/
+		# The area relative position of the cursor; &None when unknown.
+	# /limit/
+		# The number of cells that must exceed the distance between the cursor and
+		# the change for the cells to be considered for overwriting.
+
+	# [ Returns ]
+	# Pair consisting of the render parameters in effect after the sequences and the
+	# area relative position of the cursor; &None when unknown.
+	"""
+	start, position = prefix(former, latter)
+	normal = context._context_traits
+	if start >= former_cells and start >= latter_cells:
+		# Identical cells.
+		return rparams, cursor
+	edit = context.right_edge and former_cells != latter_cells
+
+	known = None
+	if cursor is not None and 0 < start - cursor[0] < limit:
+		known = overwrite(latter, position, start - cursor[0], rparams)
+		if known is not None:
+			known = context.terminal_type.encode_words(known)
+
+	if former_cells == latter_cells or edit:
+		common, stop = suffix(former, latter, min(former_cells, latter_cells) - start)
+	else:
+		common = 0
+		stop = (len(latter), 0)
+
+	if edit:
+		if common and start + common == min(former_cells, latter_cells):
+			ttype = context.terminal_type
+			if latter_cells > former_cells:
+				count = latter_cells - former_cells
+				shift = ttype.insert_characters(count)
+			else:
+				count = former_cells - latter_cells
+				shift = ttype.delete_characters(count)
+
+			# Only when shifting is shorter than redrawing the tail.
+			if len(shift) < common:
+				buffer += context.seek((start, lineno), cursor, known)
+				if latter_cells > former_cells:
+					buffer += shift
+					rparams = context.render_into(buffer, segment(latter, position, stop), rparams)
+					return rparams, (start + count, lineno)
+				else:
+					# Vacated cells are filled with the current cell color.
+					buffer += context._transition(rparams, normal)
+					buffer += shift
+					return normal, (start, lineno)
+
+		common = 0
+		stop = (len(latter), 0)
+
+	buffer += context.seek((start, lineno), cursor, known)
+	rparams = context.render_into(buffer, segment(latter, position, stop), rparams)
+	column = latter_cells - common
+
+	if latter_cells < former_cells:
+		# Cells after the former line are already clear; permit EL.
+		buffer += context._transition(rparams, normal)
+		sequence, advance = context.blank(former_cells - latter_cells, normal, True)
+		buffer += sequence
+		column += advance
+		rparams = normal
+
+	# The cursor is in the pending wrap state after writing the last column.
+	if column < context.width:
+		return rparams, (column, lineno)
+	else:
+		return rparams, None
+
+class Renderer(object):
+	"""
+	# Double buffered frame renderer for a &matrix.Screen.
+
+	# The page presented by the last frame is retained as the shadow buffer. Subsequent
+	# frames are compared line by line, and within lines, and only the changed
+	# cells are sent to the terminal. Transitions between render parameters use
+	# the &matrix.Type.cached_transition of the screen's terminal type.
+
+	# Vertical shifts of lines, such as those caused by scrolling a log view,
+	# are detected with &shift and performed by the terminal; see &scroll.
+	# Horizontal shifts within lines, such as those caused by typing, are
+	# performed with ICH and DCH; see &update.
+
+	# Frames are framed using &matrix.Screen.synchronize so that emulators supporting
+	# synchronized output paint them atomically.
+
+	# The cursor position is tracked while a frame is constructed so that the motions
+	# between the updated cells are planned by &matrix.Context.motion. The position is
+	# forgotten at the end of each frame as the application may move the cursor between frames.
+
+	# [ Properties ]
+	# /screen/
+		# The &matrix.Screen describing the dimensions and default text properties.
+	# /shadow/
+		# The &core.Phrase instances presumed to be displayed on the terminal.
+		# Empty when the state of the terminal is unknown.
+	# /cursor/
+		# The position of the cursor while constructing a frame; &None when unknown.
+	"""
+
+	def __init__(self, screen:matrix.Screen):
+		self.screen = screen
+		self.shadow = []
+		self._cellcounts = []
+		self._rparams = None
+		self._width = None
+		self.cursor = None
+
+	def invalidate(self):
+		"""
+		# Forget the shadow buffer so that the next frame clears and redraws the screen.
+		"""
+		self.shadow = []
+		self._cellcounts = []
+		self._rparams = None
+
+	def frame(self, page:core.Page) -> bytes:
+		"""
+		# Construct the sequences necessary to update the screen from the shadow buffer
+		# to &page and make &page the new shadow buffer.
+
+		# Lines beyond the screen's height are ignored, lines wider than the screen are
+		# truncated, and missing lines are cleared. The screen is redrawn when its
+		# dimensions differ from the former frame's.
+		"""
+		screen = self.screen
+		width = screen.width
+		height = screen.height
+		normal = screen._context_traits
+		empty = screen.Phrase(())
+		buffer = bytearray()
+
+		shadow = self.shadow
+		cellcounts = self._cellcounts
+		last = self._rparams
+
+		# Truncate before comparing with the shadow buffer, which holds the truncated lines.
+		lines = []
+		counts = []
+		for latter in page[:height]:
+			cc = latter.cellcount()
+			if cc > width:
+				latter = latter.rstripcells(cc - width)
+				cc = latter.cellcount()
+			lines.append(latter)
+			counts.append(cc)
+
+		if len(shadow) != height or self._width != width or last is None:
+			buffer += screen.clear()
+			shadow = self.shadow = [empty] * height
+			cellcounts = self._cellcounts = [0] * height
+			self._width = width
+			last = normal
+			self.cursor = (0, 0)
+		else:
+			self.cursor = None
+			last = self.scroll(buffer, lines, last)
+
+		for lineno in range(height):
+			if lineno < len(lines):
+				latter = lines[lineno]
+				cc = counts[lineno]
+			else:
+				latter = empty
+				cc = 0
+
+			former = shadow[lineno]
+			if latter is former or latter == former:
+				continue
+
+			last = self.line(buffer, lineno, former, cellcounts[lineno], latter, cc, last)
+			shadow[lineno] = latter
+			cellcounts[lineno] = cc
+
+		self._rparams = last
+		self.cursor = None
+		return screen.synchronize(bytes(buffer))
+
+	def scroll(self, buffer:bytearray, page:core.Page, rparams:core.RenderParameters) -> core.RenderParameters:
+		"""
+		# Detect and apply a vertical shift of the shadow buffer's lines towards &page.
+		# The lines of &page must be truncated to the screen's width as the shadow's are.
+
+		# When a run of lines in &page appears displaced in the shadow buffer, the lines are moved
+		# by the terminal and the shadow buffer is adjusted accordingly; the newly exposed lines are
+		# then drawn by &line. Regions extending to the last line of the screen use
+		# DL and IL; others are confined with a scrolling region and use SU and SD.
+
+		# [ Returns ]
+		# The render parameters in effect after the sequences.
+		"""
+		screen = self.screen
+		shadow = self.shadow
+		height = len(shadow)
+		page = page[:height]
+
+		s = shift(shadow, page)
+		if s is None:
+			return rparams
+		offset, start, stop = s
+
+		# Only worthwhile when lines that would otherwise be redrawn are moved.
+		moved = 0
+		for i in range(start, stop+1):
+			if page[i] != shadow[i]:
+				moved += 1
+		if moved < 2:
+			return rparams
+
+		if offset > 0:
+			top = start
+			bottom = stop + offset
+		else:
+			top = start + offset
+			bottom = stop
+		count = abs(offset)
+
+		normal = screen._context_traits
+		ttype = screen.terminal_type
+		buffer += screen._transition(rparams, normal)
+
+		if bottom == height - 1:
+			buffer += screen.seek((0, top))
+			if offset > 0:
+				buffer += ttype.delete_lines(count)
+			else:
+				buffer += ttype.insert_lines(count)
+		else:
+			buffer += screen.set_scrolling_region(top, bottom)
+			if offset > 0:
+				buffer += screen.scroll_up(count)
+			else:
+				buffer += screen.scroll_down(count)
+			buffer += screen.reset_scrolling_region()
+
+		empty = screen.Phrase(())
+		region = slice(top, bottom+1)
+		cellcounts = self._cellcounts
+		if offset > 0:
+			shadow[region] = shadow[top+count:bottom+1] + [empty] * count
+			cellcounts[region] = cellcounts[top+count:bottom+1] + [0] * count
+		else:
+			shadow[region] = [empty] * count + shadow[top:bottom+1-count]
+			cellcounts[region] = [0] * count + cellcounts[top:bottom+1-count]
+
+		# Scrolling regions home the cursor, and line operations move it to the first column.
+		self.cursor = None
+		return normal
+
+	def line(self,
+			buffer:bytearray, lineno:int,
+			former:core.Phrase, former_cells:int,
+			latter:core.Phrase, latter_cells:int,
+			rparams:core.RenderParameters,
+		) -> core.RenderParameters:
+		"""
+		# Append the sequences transforming the line &lineno from &former to &latter to &buffer
+		# using &update.
+
+		# [ Returns ]
+		# The render parameters in effect after the sequences.
+		"""
+		rparams, self.cursor = update(
+			self.screen, buffer, lineno,
+			former, former_cells, latter, latter_cells,
+			rparams, self.cursor
+		)
+		return rparams
+
+# Statistics reported by &Scheduler.info.
+FrameInfo = collections.namedtuple('FrameInfo', (
+	'frames', 'requests', 'bytes',
+	'render_time', 'render_maximum', 'interval',
+))
+
+class Scheduler(object):
+	"""
+	# Frame rate limiter coalescing the redraw requests of many producers.
+
+	# Producers report changes with &damage, and the event loop consults &delay to
+	# determine when to call &flush. Frames are constructed at most &rate times per second;
+	# requests made while waiting are merged into the next frame. When no frame
+	# was constructed within the last interval, the frame is constructed immediately.
+
+	# The scheduler is independent of any event loop; the &clock is injectable for
+	# testing and for loops with their own time source.
+
+	# [ Properties ]
+	# /render/
+		# Callable constructing a frame from the set of damaged regions.
+		# &None in the set designates that the entire screen is damaged.
+	# /interval/
+		# The minimum number of seconds between frames.
+	# /clock/
+		# Callable returning the current time in seconds.
+	"""
+
+	def __init__(self, render:typing.Callable[[typing.Set[object]], bytes], rate:float=60, clock=time.monotonic):
+		self.render = render
+		self.interval = 1 / rate
+		self.clock = clock
+		self._regions = set()
+		self._last = None
+
+		self._frames = 0
+		self._requests = 0
+		self._bytes = 0
+		self._render_time = 0.0
+		self._render_maximum = 0.0
+		self._first = None
+
+	@property
+	def pending(self) -> bool:
+		"""
+		# Whether damage has been reported since the last frame.
+		"""
+		return bool(self._regions)
+
+	def damage(self, region:object=None):
+		"""
+		# Record that &region needs to be redrawn; &None designates the entire screen.
+		"""
+		self._requests += 1
+		self._regions.add(region)
+
+	def delay(self) -> typing.Optional[float]:
+		"""
+		# The number of seconds until the next frame should be constructed.
+
+		# [ Returns ]
+		# &None when no damage is pending, zero when &flush should be called immediately.
+		"""
+		if not self._regions:
+			return None
+		if self._last is None:
+			return 0.0
+		return max(0.0, (self._last + self.interval) - self.clock())
+
+	def flush(self, force:bool=False) -> typing.Optional[bytes]:
+		"""
+		# Construct a frame from the pending damage when permitted by the rate.
+
+		# [ Parameters ]
+		# /force/
+			# Construct the frame regardless of the time since the last frame.
+
+		# [ Returns ]
+		# The frame or &None when no frame was constructed.
+		"""
+		if not self._regions:
+			return None
+		if not force and self.delay():
+			return None
+
+		regions = self._regions
+		self._regions = set()
+
+		clock = self.clock
+		start = clock()
+		frame = self.render(regions)
+		duration = clock() - start
+
+		if self._first is None:
+			self._first = start
+		self._last = start
+		self._frames += 1
+		self._bytes += len(frame)
+		self._render_time += duration
+		if duration > self._render_maximum:
+			self._render_maximum = duration
+
+		return frame
+
+	def info(self) -> FrameInfo:
+		"""
+		# Report the number of frames and requests, the bytes produced, the total and maximum
+		# time spent rendering, and the mean interval between frames.
+		"""
+		if self._frames > 1:
+			interval = (self._last - self._first) / (self._frames - 1)
+		else:
+			interval = 0.0
+
+		return FrameInfo(
+			self._frames, self._requests, self._bytes,
+			self._render_time, self._render_maximum, interval,
+		)
@@ -0,0 +1,237 @@
+"""
+# Column alignment for pages of &core.Phrase cells.
+
+# &Columns holds a table of phrases and maintains the width of each column as cells
+# are changed. Rendering emits the padding of aligned cells as space runs using
+# &.matrix.Context.spaces rather than constructing padding words for every cell.
+"""
+import typing
+import collections
+
+from . import core
+from . import matrix
+
+class Columns(object):
+	"""
+	# Table of &core.Phrase instances aligned into columns.
+
+	# Column widths are derived from the widest cell in the column unless fixed by
+	# &set_width. The cell counts of every column are recorded in a histogram so that
+	# changing a cell only adjusts the affected column's width.
+
+	# [ Properties ]
+	# /alignments/
+		# The alignment of each column; `'left'`, `'right'`, or `'center'`.
+	# /separation/
+		# The number of blank cells placed between columns.
+	# /rows/
+		# The phrases of each row.
+	"""
+
+	def __init__(self, alignments:typing.Sequence[str], separation:int=1):
+		self.alignments = list(alignments)
+		self.separation = separation
+		self.rows = []
+
+		n = len(self.alignments)
+		self._cells = []
+		self._histograms = [collections.Counter() for i in range(n)]
+		self._maximums = [0] * n
+		self._fixed = [None] * n
+
+	def _include(self, column, cells):
+		self._histograms[column][cells] += 1
+		if cells > self._maximums[column]:
+			self._maximums[column] = cells
+
+	def _exclude(self, column, cells):
+		h = self._histograms[column]
+		h[cells] -= 1
+		if not h[cells]:
+			del h[cells]
+			if cells == self._maximums[column]:
+				# Only rescan when the widest cell was removed.
+				self._maximums[column] = max(h, default=0)
+
+	def _normalize(self, row, Phrase=core.Phrase):
+		row = list(row)
+		n = len(self.alignments)
+		if len(row) < n:
+			row.extend(Phrase(()) for i in range(n - len(row)))
+		elif len(row) > n:
+			raise ValueError("row has more cells than there are columns")
+		return row
+
+	def load(self, rows:typing.Iterable[typing.Sequence[core.Phrase]]):
+		"""
+		# Replace the rows of the table and calculate the column widths.
+		"""
+		self.rows = []
+		self._cells = []
+		for h in self._histograms:
+			h.clear()
+		self._maximums = [0] * len(self.alignments)
+		self.extend(rows)
+		return self
+
+	def extend(self, rows:typing.Iterable[typing.Sequence[core.Phrase]]):
+		"""
+		# Append the &rows to the table.
+		"""
+		for row in rows:
+			self.insert(len(self.rows), row)
+		return self
+
+	def insert(self, index:int, row:typing.Sequence[core.Phrase]):
+		"""
+		# Insert the &row before &index.
+		"""
+		row = self._normalize(row)
+		counts = [x.cellcount() for x in row]
+		for column, cells in enumerate(counts):
+			self._include(column, cells)
+
+		self.rows.insert(index, row)
+		self._cells.insert(index, counts)
+		return self
+
+	def delete(self, index:int):
+		"""
+		# Remove the row at &index.
+		"""
+		del self.rows[index]
+		counts = self._cells.pop(index)
+		for column, cells in enumerate(counts):
+			self._exclude(column, cells)
+		return self
+
+	def update(self, index:int, column:int, phrase:core.Phrase):
+		"""
+		# Replace the phrase of the cell at the &index row and &column.
+		"""
+		cells = phrase.cellcount()
+		counts = self._cells[index]
+		self._exclude(column, counts[column])
+		self._include(column, cells)
+		counts[column] = cells
+		self.rows[index][column] = phrase
+		return self
+
+	def set_width(self, column:int, width:typing.Optional[int]):
+		"""
+		# Fix the width of the &column; cells wider than &width are truncated using
+		# &core.Phrase.fit. &None restores the width of the widest cell.
+		"""
+		self._fixed[column] = width
+		return self
+
+	def width(self, column:int) -> int:
+		"""
+		# The number of cells occupied by the &column.
+		"""
+		fixed = self._fixed[column]
+		if fixed is not None:
+			return fixed
+		return self._maximums[column]
+
+	def widths(self) -> typing.Sequence[int]:
+		"""
+		# The widths of all the columns.
+		"""
+		return [self.width(i) for i in range(len(self.alignments))]
+
+	def cellcount(self) -> int:
+		"""
+		# The number of cells occupied by a row of the table.
+		"""
+		n = len(self.alignments)
+		return sum(self.widths()) + (self.separation * (n - 1) if n else 0)
+
+	def _render(self, context, index, limit=None, substitute=(lambda x: ' ')):
+		# Construct the row's sequences and count the cells they occupy.
+		# When given, the row is clipped to &limit cells.
+		normal = context._context_traits
+		transition = context._transition
+		render = context.render_into
+		spaces = context.spaces
+		buffer = bytearray()
+
+		row = self.rows[index]
+		counts = self._cells[index]
+		last = normal
+		blank = 0
+		emitted = 0
+
+		for column, (phrase, cells, align) in enumerate(zip(row, counts, self.alignments)):
+			width = self.width(column)
+			if column:
+				blank += self.separation
+
+			if cells > width:
+				phrase = phrase.fit(width)
+				cells = width
+
+			extra = width - cells
+			if align == 'right':
+				blank += extra
+				extra = 0
+			elif align == 'center':
+				blank += extra // 2
+				extra -= extra // 2
+
+			clipped = limit is not None and emitted + blank + cells >= limit
+			if clipped:
+				excess = emitted + blank + cells - limit
+				if excess >= cells:
+					break
+				if excess:
+					phrase = phrase.rstripcells(excess, substitute, cells=matrix.cells)
+					cells -= excess
+
+			if cells:
+				if blank:
+					buffer += transition(last, normal)
+					buffer += spaces(blank)
+					last = normal
+					emitted += blank
+					blank = 0
+
+				last = render(buffer, phrase, last)
+				emitted += cells
+			if clipped:
+				break
+			blank += extra
+
+		buffer += transition(last, normal)
+		return bytes(buffer), emitted
+
+	def render(self, context, index:int) -> typing.Iterable[bytes]:
+		"""
+		# Render the row at &index using &context.
+
+		# The sequences begin and end with the context's configured text and cell colors
+		# and traits. Padding is emitted using &context.spaces with those parameters
+		# and adjacent blanks, including the separation between columns, are combined into
+		# a single run. Trailing blanks are not emitted.
+		"""
+		yield self._render(context, index)[0]
+
+	def print(self, context, start:int=0, stop:int=None) -> typing.Iterable[bytes]:
+		"""
+		# Print the rows from &start to &stop using &context with the conventions of
+		# &.matrix.Context.print; rows wider than the context are truncated, and the
+		# remainder of each line is cleared with &.matrix.Context.blank.
+		"""
+		rst = context.reset_text()
+		nl = context.seek_next_line
+		blank = context.blank
+		normal = context._context_traits
+		width = context.width
+
+		yield rst
+		for index in range(start, len(self.rows) if stop is None else stop):
+			row, cells = self._render(context, index, width)
+			yield row
+			if cells < width:
+				yield blank(width - cells, normal, True)[0]
+			yield nl()
@@ -5,17 +5,198 @@
 # to be transmitted to the terminal.
 
 # [ Engineering ]
-# Many sequence codes are hardcoded in &Context and &Screen. The exact codes
-# should be moved to &Type and symbolically referenced in preparation for some termcap
-# loading.
+# Sequences without parameters are described by &Type.constant_sequences and compiled
+# into attributes of &Type instances; &Context and &Screen methods return them directly.
+# Parameterized sequence codes remain hardcoded in &Context and &Screen, and should be
+# moved to &Type in preparation for some termcap loading.
 """
 import functools
 import itertools
+import threading
+import collections
 import typing
 import codecs
 
-from ..system import text
 from . import core
+from . import palette
+
+# Statistics reported by the caches held by &Type; field compatible with &functools.lru_cache.
+CacheInfo = collections.namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+class Cache(object):
+	"""
+	# Handle for a &functools.lru_cache wrapped function held by &Type.
+
+	# Provides the same interface as &Transitions so that the caches of a &Type can be
+	# inspected and managed uniformly; see &Type.caches.
+	"""
+	__slots__ = ('function',)
+
+	def __init__(self, function):
+		self.function = function
+
+	def info(self) -> CacheInfo:
+		"""
+		# Report the statistics of the cache.
+		"""
+		return CacheInfo(*self.function.cache_info())
+
+	def clear(self):
+		"""
+		# Remove all entries from the cache.
+		"""
+		self.function.cache_clear()
+
+	def warm(self, keys:typing.Iterable[object]):
+		"""
+		# Populate the cache with the results of the given &keys.
+		"""
+		f = self.function
+		for k in keys:
+			f(k)
+
+class Integers(dict):
+	"""
+	# Dense table of encoded decimal integers with an overflow cache.
+
+	# The integers from zero up to the reserved &limit are encoded when reserved and
+	# retrieved with direct indexing; contexts use the bound (id)`__getitem__` as their
+	# encoder. Integers outside of the table are encoded by the &overflow cache.
+
+	# The reserved entries are never evicted; &Type.caches holds a &Cache handle of
+	# the &overflow cache for statistics and management.
+
+	# [ Properties ]
+	# /limit/
+		# The number of reserved integers.
+	# /overflow/
+		# The &functools.lru_cache wrapped encoder used for integers outside of the table.
+	"""
+
+	def __init__(self, encode, size:int, limit:int=256):
+		super().__init__()
+		self.encode = encode
+		self.overflow = functools.lru_cache(size)(encode)
+		self.limit = 0
+		self.reserve(limit)
+
+	def __missing__(self, integer):
+		return self.overflow(integer)
+
+	def reserve(self, limit:int):
+		"""
+		# Extend the table to hold the encodings of the integers less than &limit.
+		"""
+		encode = self.encode
+		for i in range(self.limit, limit):
+			self[i] = encode(i)
+		if limit > self.limit:
+			self.limit = limit
+		return self
+
+	def clear_overflow(self):
+		"""
+		# Remove all entries from the &overflow cache; the reserved entries are retained.
+		"""
+		self.overflow.cache_clear()
+
+class Transitions(object):
+	"""
+	# Bounded table of SGR sequences for transitioning between &core.RenderParameters.
+
+	# The table is organized by the former parameters, and each row maps the latter
+	# parameters to the constructed CSI sequence. Entries are filled lazily using
+	# &Type.transition_render_parameters. When &limit entries are present, the table is
+	# cleared before the next entry is added.
+
+	# The first instance of a set of parameters seen by the table is used as the key,
+	# so &intern can be used to share instances and allow identity comparisons
+	# to satisfy lookups.
+
+	# [ Properties ]
+	# /limit/
+		# The maximum number of transitions held by the table.
+	# /hits/
+		# The number of lookups satisfied by the table.
+	# /misses/
+		# The number of lookups that constructed a transition.
+	# /evictions/
+		# The number of times the table was cleared after reaching &limit.
+	"""
+
+	def __init__(self, type, limit:int=1024):
+		self.type = type
+		self.limit = limit
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._size = 0
+		self._rows = {}
+		self._interned = {}
+
+	def __len__(self):
+		return self._size
+
+	def intern(self, rparams:core.RenderParameters) -> core.RenderParameters:
+		"""
+		# Retrieve the instance of &rparams used by the table.
+		"""
+		return self._interned.setdefault(rparams, rparams)
+
+	def __call__(self, former:core.RenderParameters, latter:core.RenderParameters) -> bytes:
+		"""
+		# Retrieve or construct the SGR sequence transitioning from &former to &latter.
+		"""
+		row = self._rows.get(former)
+		if row is not None:
+			seq = row.get(latter)
+			if seq is not None:
+				self.hits += 1
+				return seq
+
+		self.misses += 1
+		seq = self.type.transition_render_parameters(former, latter)
+
+		if self._size >= self.limit:
+			self.evictions += 1
+			self.clear()
+			row = None
+
+		if row is None:
+			former = self.intern(former)
+			row = self._rows[former] = {}
+
+		row[self.intern(latter)] = seq
+		self._size += 1
+		return seq
+
+	def clear(self):
+		"""
+		# Remove all entries from the table; statistics are retained.
+		"""
+		self._rows.clear()
+		self._interned.clear()
+		self._size = 0
+
+	def warm(self, pairs:typing.Iterable[typing.Tuple[core.RenderParameters, core.RenderParameters]]):
+		"""
+		# Populate the table with the transitions of the given (former, latter) &pairs.
+		"""
+		for former, latter in pairs:
+			self(former, latter)
+
+	def info(self) -> CacheInfo:
+		"""
+		# Report the statistics of the table.
+		"""
+		return CacheInfo(self.hits, self.misses, self.limit, self._size)
+
+	def rate(self) -> float:
+		"""
+		# The ratio of lookups satisfied by the table.
+		"""
+		total = self.hits + self.misses
+		return (self.hits / total) if total else 0.0
 
 class Type(object):
 	"""
@@ -25,6 +206,36 @@ class Type(object):
 	# standard terminfo databases are not referenced as the target applications are those
 	# committed to modern terminal emulators supporting commonly employed standards or practices.
 
+	# [ Properties ]
+	# /color_depth/
+		# The colors supported by the terminal; one of (id)`truecolor`, (id)`xterm-256`,
+		# (id)`tty-16`, or (id)`mono`. Colors are degraded using &degrade_color when
+		# the depth is not (id)`truecolor`.
+	# /constant_sequences/
+		# The capability profile describing the sequences that take no parameters.
+		# Maps attribute names to the method and arguments constructing the sequence;
+		# the sequences are compiled into instance attributes by &compile_sequences.
+		# Subclasses may override entries in order to describe the capabilities
+		# of a particular terminal.
+	# /caches/
+		# Dictionary of the cache handles held by the instance. The sizes of the
+		# caches are configured by the constructor's keyword parameters.
+		# /(id)`integer-encode`/
+			# &Cache of the encoded decimal parameters of control sequences outside
+			# of the reserved range of the &Integers table.
+		# /(id)`word-encode`/
+			# &Cache of sanitized and encoded words that are not printable ASCII.
+		# /(id)`transition`/
+			# &Transitions table of SGR sequences.
+	# /encode_words/
+		# The encoder used to render the text of words. Printable ASCII text is encoded
+		# directly when the encoding is a superset of ASCII; other text is sanitized
+		# with &control_table and encoded through the (id)`word-encode` cache.
+	# /control_table/
+		# The &str.translate table replacing C0, DEL, and C1 control characters
+		# with glyphs from the Control Pictures block; &core.control_table.
+		# See &core.cells.
+
 	# [ Engineering ]
 	# Currently unstable API. It was quickly ripped out of &Context.
 	"""
@@ -36,7 +247,7 @@ class Type(object):
 	_join = _field_separator.join
 	_csi_init = _escape_character + b'['
 	_osc_init = _escape_character + b']'
-	_st = _escape_character = b'\\' # String Terminator
+	_st = _escape_character + b'\\' # String Terminator
 	_wm = b't'
 
 	# Private Modes
@@ -49,9 +260,15 @@ class Type(object):
 	# Synchronize with &.control
 	_pm_origin = 6
 	_pm_screen = 1049
+	_pm_synchronize = 2026
+	_pm_request = b'$p'
 
 	_reset_text_attributes = b'0'
 
+	# Replacement glyphs for the control characters of words.
+	control_mapping = core.control_mapping
+	control_table = core.control_table
+
 	# Support for SGR color.
 	@staticmethod
 	def select_foreground_16(code, offsets=(30, 90)):
@@ -86,6 +303,43 @@ class Type(object):
 		'overline': (b'53', b'55'),
 	}
 
+	constant_sequences = {
+		'cursor_home': ('csi', b'H'),
+		'cursor_up': ('csi', b'A'),
+		'cursor_down': ('csi', b'B'),
+		'cursor_forward': ('csi', b'C'),
+		'cursor_backward': ('csi', b'D'),
+		'clear_screen': ('csi', b'2J'),
+		'clear_to_bottom': ('csi', b'J'),
+		'clear_before_cursor': ('csi', b'K', b'1'),
+		'clear_after_cursor': ('csi', b'K'),
+		'erase_character': ('csi', b'X'),
+		'soft_reset': ('csi', b'!p'),
+		'reset_scrolling_region': ('csi', b'r'),
+		'store_cursor': ('csi', b's'),
+		'restore_cursor': ('csi', b'u'),
+		'request_cursor_position': ('csi', b'n', b'6'),
+		'request_device_status': ('csi', b'n', b'5'),
+		'show_cursor': ('decset', (25,)),
+		'hide_cursor': ('decrst', (25,)),
+		'start_cursor_blink': ('decset', (12,)),
+		'stop_cursor_blink': ('decrst', (12,)),
+		'enter_origin_mode': ('decset', (_pm_origin,)),
+		'exit_origin_mode': ('decrst', (_pm_origin,)),
+		'enter_alternate_screen': ('decset', (_pm_screen,)),
+		'exit_alternate_screen': ('decrst', (_pm_screen,)),
+		'begin_synchronized_update': ('decset', (_pm_synchronize,)),
+		'end_synchronized_update': ('decrst', (_pm_synchronize,)),
+	}
+
+	def compile_sequences(self):
+		"""
+		# Construct the sequences described by &constant_sequences and
+		# assign them to the instance.
+		"""
+		for name, (method, *args) in self.constant_sequences.items():
+			setattr(self, name, getattr(self, method)(*args))
+
 	def esc(self, string:bytes):
 		"""
 		# Escape prefixed string.
@@ -158,6 +412,14 @@ class Type(object):
 		"""
 		return self.pm(self._pm_restore, map(self.cached_integer_encode, options))
 
+	def decrqm(self, option:int):
+		"""
+		# Request the state of the private mode &option. (DECRQM)
+
+		# The terminal reports the state with a (id)`CSI ? option ; Ps $ y` sequence.
+		"""
+		return self.pm(self._pm_request, (self.cached_integer_encode(option),))
+
 	def wm_title(self, title):
 		"""
 		# Instruct the emulator to use the given title for the window.
@@ -241,6 +503,67 @@ class Type(object):
 				else:
 					return (cie(self.select_background_16(color_code)),)
 
+	color_depths = {'truecolor', 'xterm-256', 'tty-16', 'mono'}
+	selection_limit = 4096
+
+	def degrade_color(self, color_code:int) -> int:
+		"""
+		# Map &color_code to the closest color available at the configured &color_depth.
+
+		# 24-bit colors are quantized using &palette.quantize_256 or &palette.quantize_16,
+		# xterm-256 colors are reduced using &palette.tty16_reduction, and all colors
+		# become the terminal default for (id)`mono`.
+		"""
+		depth = self.color_depth
+		if depth == 'truecolor' or color_code == -1024:
+			return color_code
+		elif depth == 'mono':
+			return -1024
+
+		if color_code >= 0:
+			rgb = color_code & 0xFFFFFF
+			if depth == 'xterm-256':
+				return -(palette.quantize_256(rgb) + 1)
+			else:
+				return -(palette.quantize_16(rgb) + 512)
+		elif color_code >= -256:
+			if depth == 'tty-16':
+				return -(palette.tty16_reduction[-color_code - 1] + 512)
+
+		return color_code
+
+	def select_degraded_color(self, target, color_code):
+		"""
+		# &select_color variant used when the &color_depth is not (id)`truecolor`.
+
+		# The parameters of the &degrade_color result are cached per color so that
+		# repeated selections do not quantize.
+		"""
+		selections = self._selections[target]
+		try:
+			return selections[color_code]
+		except KeyError:
+			if len(selections) >= self.selection_limit:
+				selections.clear()
+
+			params = selections[color_code] = Type.select_color(self, target, self.degrade_color(color_code))
+			return params
+
+	def select_degraded_transition(self, former, latter):
+		"""
+		# &select_transition variant used when the &color_depth is not (id)`truecolor`.
+
+		# The colors are degraded before they are compared so that colors mapping to
+		# the same code do not emit a redundant selection.
+		"""
+		def degrade(color, degrade=self.degrade_color):
+			return color if color is None else degrade(color)
+
+		return Type.select_transition(self,
+			(degrade(former[0]), degrade(former[1]), former[2]),
+			(degrade(latter[0]), degrade(latter[1]), latter[2]),
+		)
+
 	@staticmethod
 	def transition_traits(style_codes, from_traits, to_traits, chain=itertools.chain):
 		kept = from_traits & to_traits # traits to ignore
@@ -304,10 +627,25 @@ class Type(object):
 			encoding,
 			errors='surrogateescape',
 			integer_encode_cache_size=32,
-			word_encode_cache_size=32,
+			word_encode_cache_size=256,
+			transition_cache_size=1024,
+			integer_table_size=256,
+			color_depth='truecolor',
 		):
 
+		if color_depth not in self.color_depths:
+			raise ValueError("unknown color depth: " + repr(color_depth))
+
 		self.encoding = encoding
+		self.errors = errors
+		self.color_depth = color_depth
+		self._selections = ({}, {})
+		if color_depth != 'truecolor':
+			# Shadow the native selection; truecolor remains a direct call.
+			self.select_color = self.select_degraded_color
+			self.select_transition = self.select_degraded_transition
+		self._cache_sizes = (integer_encode_cache_size, word_encode_cache_size, transition_cache_size)
+		self._thread_local = threading.local()
 
 		ef = codecs.getencoder(encoding) # standard library codecs
 		self._encoder = ef
@@ -318,16 +656,115 @@ class Type(object):
 		# Direct encoder access.
 		self.encode = ttype_encode
 
-		# XXX: refer to cache handle rather than functools.lru_cache directly
-		self.cached_integer_encode = functools.lru_cache(integer_encode_cache_size)(ttype_encode)
-		self.cached_words_encode = functools.lru_cache(word_encode_cache_size)(ttype_encode)
+		# The cached callables are referenced directly by contexts;
+		# &caches provides the handles used to manage them.
+		self.integers = Integers(ttype_encode, integer_encode_cache_size, integer_table_size)
+		self.cached_integer_encode = self.integers.__getitem__
+		self.cached_transition = Transitions(self, transition_cache_size)
+
+		# Words are sanitized as they are encoded; only text that is not printable
+		# is scanned by translate, and the result is retained by the word cache.
+		def sanitized_encode(string, errors=errors, ef=ef, isprintable=str.isprintable, table=self.control_table):
+			if not isprintable(string):
+				string = string.translate(table)
+			return ef(string, errors)[0]
+		self.cached_words_encode = functools.lru_cache(word_encode_cache_size)(sanitized_encode)
+
+		# Word encoding used by rendering; printable ASCII text is encoded directly when
+		# the encoding is a superset, and other text is retained by the word cache.
+		ascii = bytes(range(128))
+		if ef(ascii.decode('ascii'), errors)[0] == ascii:
+			def words_encode(obj, str=str, isascii=str.isascii, isprintable=str.isprintable, cached=self.cached_words_encode):
+				string = str(obj)
+				if isascii(string) and isprintable(string):
+					return string.encode('ascii')
+				return cached(string)
+		else:
+			def words_encode(obj, str=str, cached=self.cached_words_encode):
+				return cached(str(obj))
+		self.encode_words = words_encode
+
+		# Compilation may encode integers beyond the table; start with an empty overflow.
+		self.compile_sequences()
+		self.integers.clear_overflow()
+
+		self.caches = {
+			'integer-encode': Cache(self.integers.overflow),
+			'word-encode': Cache(self.cached_words_encode),
+			'transition': self.cached_transition,
+		}
+
+	def reserve_integers(self, limit:int):
+		"""
+		# Extend the dense integer table to hold the integers less than &limit.
+
+		# Called by &Context.context_set_dimensions so that coordinates and counts
+		# within the context's area never reach the overflow cache.
+		"""
+		if limit > self.integers.limit:
+			self.integers.reserve(limit)
+		return self
+
+	def cache_info(self) -> typing.Mapping[str, CacheInfo]:
+		"""
+		# Report the statistics of all the caches held by the instance.
+
+		# [ Returns ]
+		# Dictionary mapping the cache names used by &caches to &CacheInfo instances.
+		"""
+		return {k: v.info() for k, v in self.caches.items()}
+
+	def clear_caches(self, *names:str):
+		"""
+		# Remove the entries of the named caches, or all caches when no &names are given.
+		"""
+		for k in (names or self.caches):
+			self.caches[k].clear()
 
-		umethod = self.__class__.transition_render_parameters
-		self.cached_transition = (functools.lru_cache(16)(umethod))
+	def warm_cache(self, name:str, keys:typing.Iterable[object]):
+		"""
+		# Populate the cache identified by &name with the results of &keys.
+
+		# Integer and word caches expect the values to encode, and the (id)`transition`
+		# cache expects pairs of &core.RenderParameters.
+		"""
+		self.caches[name].warm(keys)
+
+	def replicate(self) -> 'Type':
+		"""
+		# Construct a new instance with the same configuration as &self, but
+		# with its own, empty, caches.
+		"""
+		ics, wcs, tcs = self._cache_sizes
+		return self.__class__(self.encoding, self.errors,
+			integer_encode_cache_size=ics,
+			word_encode_cache_size=wcs,
+			transition_cache_size=tcs,
+			integer_table_size=self.integers.limit,
+			color_depth=self.color_depth,
+		)
+
+	def local(self) -> 'Type':
+		"""
+		# Retrieve the replica of &self owned by the calling thread.
+
+		# The caches held by a &Type are shared by every &Context using it. When
+		# rendering from multiple threads, the contexts should be given the thread's
+		# replica in order to avoid contending over, and thrashing, a single set of caches.
+		# The replica is created by &replicate on first use in a thread.
+		"""
+		try:
+			return self._thread_local.type
+		except AttributeError:
+			replica = self._thread_local.type = self.replicate()
+			return replica
 
 # The default terminal type used by &Context.
 utf8_terminal_type = Type('utf-8')
 
+# The cells occupied by text rendered by a &Context; control characters are replaced.
+cells = core.cells
+
 class Context(object):
 	"""
 	# Rendering Context for character matrices.
@@ -352,6 +789,8 @@ class Context(object):
 	# /Phrase/
 		# Sequence of &Words type. The primary interest of higher-level methods on &Context.
 		# Passed to &render and &print.
+	# /PhraseBuilder/
+		# Mutable accumulator for constructing &Phrase instances word by word.
 	# /Words/
 		# Named type annotation describing the contents of a &Phrase.
 	# /Page/
@@ -361,6 +800,9 @@ class Context(object):
 	# /normal_render_parameters/
 		# A &RenderParameters instance containing the default text and cell color without
 		# any &Traits.
+	# /right_edge/
+		# Whether the last column of the area is the last column of the terminal.
+		# Permits &blank to clear the remainder of a line using EL.
 	"""
 
 	# Provide context instance relative access for allowing overloading and convenience.
@@ -372,23 +814,25 @@ class Context(object):
 		RenderParameters, \
 		Words, \
 		Phrase, \
+		PhraseBuilder, \
 		Page
 
-	control_mapping = {chr(i): chr(0x2400 + i) for i in range(32)}
-	control_table = str.maketrans(control_mapping)
+	control_mapping = Type.control_mapping
+	control_table = Type.control_table
 
 	@staticmethod
-	@functools.lru_cache(32)
 	def translate(spoint, point):
 		return (point[0] + spoint[0], point[1] + spoint[1])
 
 	point = (None, None)
 	dimensions = (None, None)
 	width = height = None
+	right_edge = False
+
 	def __init__(self, type=utf8_terminal_type):
 		self.terminal_type = type
 
-		self._transition = functools.partial(type.cached_transition, type)
+		self._transition = type.cached_transition
 		self._csi = type.csi
 		self._osc = type.osc
 		self._csi_filter_empty = type.csi_filter_empty
@@ -417,6 +861,13 @@ class Context(object):
 		self.point = point
 		return self
 
+	def context_set_right_edge(self, right_edge:bool) -> 'Context':
+		"""
+		# Designate whether the area extends to the last column of the terminal.
+		"""
+		self.right_edge = right_edge
+		return self
+
 	def context_set_dimensions(self, dimensions) -> 'Context':
 		"""
 		# Designate the width and height of the character matrix being targeted.
@@ -424,6 +875,8 @@ class Context(object):
 		"""
 		self.width, self.height = dimensions
 		self.dimensions = dimensions
+		# Coordinates are one-based.
+		self.terminal_type.reserve_integers(max(dimensions) + 2)
 		return self
 
 	def context_set_text_color(self, color_id) -> 'Context':
@@ -514,13 +967,16 @@ class Context(object):
 			self.terminal_type.select_color(False, self._context_cell_color)
 		))
 
-	def draw_words(self, phrasewordtext, control_map=control_table):
+	def draw_words(self, phrasewordtext, control_map=None):
 		"""
-		# Translate the given &phraseword with &control_map and encode it
-		# with the Context's configured encoding.
+		# Encode the given &phraseword with the Context's configured encoding.
+		# Control characters are replaced by the terminal type's &Type.encode_words;
+		# when given, &control_map is applied beforehand.
 		"""
 
-		return self.terminal_type.encode(phrasewordtext.translate(control_map))
+		if control_map is not None:
+			phrasewordtext = phrasewordtext.translate(control_map)
+		return self.terminal_type.encode_words(phrasewordtext)
 
 	def render(self, phrase:typing.Iterable[Words], rparams:RenderParameters=None) -> typing.Iterable[bytes]:
 		"""
@@ -541,7 +997,7 @@ class Context(object):
 			# provided to the next render call to make minimal transitions.
 		"""
 
-		e = self.terminal_type.encode
+		e = self.terminal_type.encode_words
 		transition = self._transition
 
 		if rparams is None:
@@ -556,6 +1012,97 @@ class Context(object):
 			last = to
 			yield e(w)
 
+	def render_into(self, buffer:bytearray, phrase:typing.Iterable[Words], rparams:RenderParameters=None) -> RenderParameters:
+		"""
+		# Render the given &phrase by appending the sequences to &buffer.
+
+		# Identical to &render, but the transitions and encoded words are appended
+		# to the given &buffer rather than being produced as individual &bytes instances.
+
+		# [ Parameters ]
+		# /buffer/
+			# The &bytearray that will be extended with the sequences.
+		# /phrase/
+			# The sequence of words to render.
+		# /rparams/
+			# The render parameters presumed to be in effect before the phrase.
+			# If &None, the configured text and cell colors are used.
+
+		# [ Returns ]
+		# The &RenderParameters in effect after the phrase; suitable for passing to
+		# the next &render_into call.
+		"""
+
+		e = self.terminal_type.encode_words
+		transition = self._transition
+
+		if rparams is None:
+			last = self._context_traits
+		else:
+			last = rparams
+
+		for words in phrase:
+			w, to = words[1:3]
+			if to != last:
+				buffer += transition(last, to)
+				last = to
+			buffer += e(w)
+
+		return last
+
+	def print_into(self,
+			buffer:bytearray,
+			phrases:Page,
+			cellcounts:typing.Sequence[int],
+			indentations:typing.Sequence[int]=itertools.repeat(0),
+			width=None,
+			zip=zip
+		) -> RenderParameters:
+		"""
+		# Print the page of phrases by appending the sequences to &buffer.
+
+		# Identical to &print, but the sequences are appended to &buffer in order to
+		# construct a single contiguous frame.
+
+		# [ Returns ]
+		# The &RenderParameters in effect after the page; always the context's
+		# configured text and cell colors as each line is terminated with &reset_text.
+		"""
+
+		rst = self.reset_text()
+		nl = self.seek_next_line
+		blank = self.blank
+		render = self.render_into
+		indent = self.spaces
+		normal = self._context_traits
+
+		width = width or self.width
+		eol = width == self.width
+		adjustment = 0
+		assert width is not None and width >= 0 #:Rendering Context misconfigured or bad &width parameter.
+
+		buffer += rst
+
+		for x, cc, ic in zip(phrases, cellcounts, indentations):
+			if ic:
+				buffer += indent(ic)
+				cc += ic
+
+			adjustment = width - cc
+			if adjustment < 0:
+				# Cells exceeds width.
+				render(buffer, x.rstripcells(-adjustment), normal)
+				buffer += rst
+				buffer += nl()
+			else:
+				# Width exceeds cells.
+				render(buffer, x, normal)
+				buffer += rst
+				buffer += blank(adjustment, normal, eol)[0]
+				buffer += nl()
+
+		return normal
+
 	def print(self,
 			phrases:Page,
 			cellcounts:typing.Sequence[int],
@@ -589,11 +1136,13 @@ class Context(object):
 
 		rst = self.reset_text()
 		nl = self.seek_next_line
-		erase = self.erase
+		blank = self.blank
 		render = self.render
 		indent = self.spaces
+		normal = self._context_traits
 
 		width = width or self.width
+		eol = width == self.width
 		adjustment = 0
 		assert width is not None and width >= 0 #:Rendering Context misconfigured or bad &width parameter.
 
@@ -614,18 +1163,56 @@ class Context(object):
 			else:
 				# Width exceeds cells.
 				yield b''.join(render(x))
-				yield rst + erase(adjustment) + nl()
+				yield rst + blank(adjustment, normal, eol)[0] + nl()
 
 	def spaces(self, count):
 		"""
 		# Construct a sequence or characters necessary for writing &count spaces.
-		# Uses REP.
+		# Uses REP when it is shorter than the literal spaces.
 		"""
-		if count == 0:
-			return b''
+		if count < 5:
+			return b' ' * count
 
 		return b' ' + self._csi(b'b', self.encode(count-1))
 
+	def blank(self, count, rparams=None, eol=False) -> typing.Tuple[bytes, int]:
+		"""
+		# Construct the shortest sequence clearing &count cells from the cursor using
+		# the current cell color.
+
+		# Literal spaces and REP are only considered when &rparams has no &Traits as
+		# decorations would be drawn over spaces; ECH, and EL when &eol is permitted,
+		# are always considered.
+
+		# [ Parameters ]
+		# /count/
+			# The number of cells to clear.
+		# /rparams/
+			# The &RenderParameters in effect. &None is equivalent to parameters without traits.
+		# /eol/
+			# Whether the cells after the cleared cells may be cleared as well.
+			# Ignored unless the area extends to the terminal's &right_edge.
+
+		# [ Returns ]
+		# Pair consisting of the sequence and the number of cells that the cursor advanced.
+		"""
+		if count <= 0:
+			return (b'', 0)
+
+		if eol and self.right_edge:
+			clear = self.terminal_type.clear_after_cursor
+		elif count == 1:
+			clear = self.terminal_type.erase_character
+		else:
+			clear = self._csi(b'X', self.encode(count))
+
+		if rparams is None or not rparams[2]:
+			spaces = self.spaces(count)
+			if len(spaces) < len(clear):
+				return (spaces, count)
+
+		return (clear, 0)
+
 	def clear_line(self, lineno):
 		return self.seek_line(lineno) + self.clear_current_line()
 
@@ -633,16 +1220,17 @@ class Context(object):
 		return self._csi(self.encode(lineno) + b'J')
 
 	def clear_to_bottom(self):
-		return self._csi(b'J')
+		return self.terminal_type.clear_to_bottom
 
 	def clear_before_cursor(self):
-		return self._csi(b'K', 1)
+		return self.terminal_type.clear_before_cursor
 
 	def clear_after_cursor(self):
-		return self._csi(b'K')
+		return self.terminal_type.clear_after_cursor
 
 	def clear_current_line(self):
-		return self.clear_before_cursor() + self.clear_after_cursor()
+		ttype = self.terminal_type
+		return ttype.clear_before_cursor + ttype.clear_after_cursor
 
 	def clear(self):
 		"""
@@ -716,11 +1304,92 @@ class Context(object):
 		h, v = self.dimensions
 		return self.seek((h-1, v-1))
 
-	def seek(self, point):
+	def motion(self, origin, point, overwrite:bytes=None, len=len) -> bytes:
+		"""
+		# Construct the shortest sequence moving the cursor from &origin to &point.
+
+		# The candidates are an absolute CUP, using its short forms, and the combination
+		# of the cheapest vertical and horizontal motions. Vertical motions are CUU/CUD
+		# and VPA, and horizontal motions are CUF/CUB, CHA, CR followed by CUF, backspaces,
+		# and the &overwrite of known cells. When &point is in the first column of the
+		# screen and below &origin, carriage return and line feeds are also considered.
+
+		# [ Parameters ]
+		# /origin/
+			# The area relative position of the cursor.
+			# Must not be in the pending wrap state after writing the last column.
+		# /point/
+			# The area relative position to move the cursor to.
+		# /overwrite/
+			# The encoded cells of &point's line from the column of &origin to &point when
+			# &point is to the right of &origin and the cells were drawn using the current
+			# render parameters. Used after the vertical motion, if any.
+		"""
+		ox, oy = origin
+		px, py = point
+		dx = px - ox
+		dy = py - oy
+		if not dx and not dy:
+			return b''
+
+		csi = self._csi
+		encode = self.encode
+		ttype = self.terminal_type
+		sx, sy = self.translate(self.point, point)
+
+		# Absolute positioning; parameters of one are defaults.
+		if sx:
+			best = csi(b'H', encode(sy+1), encode(sx+1))
+		elif sy:
+			best = csi(b'H', encode(sy+1))
+		else:
+			best = ttype.cursor_home
+
+		if sx == 0 and 0 < dy < len(best):
+			best = min(best, b'\r' + (b'\n' * dy), key=len)
+
+		if dy:
+			vertical = min(
+				csi(b'B' if dy > 0 else b'A', encode(abs(dy))) if abs(dy) != 1 else (ttype.cursor_down if dy > 0 else ttype.cursor_up),
+				csi(b'd', encode(sy+1)),
+				key=len
+			)
+		else:
+			vertical = b''
+
+		if dx:
+			candidates = [
+				csi(b'C' if dx > 0 else b'D', encode(abs(dx))) if abs(dx) != 1 else (ttype.cursor_forward if dx > 0 else ttype.cursor_backward),
+				csi(b'G', encode(sx+1)),
+				(b'\r' + (csi(b'C', encode(sx)) if sx != 1 else ttype.cursor_forward)) if sx else b'\r',
+			]
+			if dx < 0 and -dx < 4:
+				candidates.append(b'\b' * -dx)
+			elif dx > 0 and overwrite is not None:
+				candidates.append(overwrite)
+			horizontal = min(candidates, key=len)
+		else:
+			horizontal = b''
+
+		return min(best, vertical + horizontal, key=len)
+
+	def seek(self, point, origin=None, overwrite:bytes=None):
 		"""
 		# Seek to the point relative to the area and store the point on the context.
+
+		# [ Parameters ]
+		# /point/
+			# The area relative position to move the cursor to.
+		# /origin/
+			# The area relative position of the cursor, when known.
+			# When provided, the sequence is planned by &motion; otherwise, an absolute
+			# positioning sequence is used.
+		# /overwrite/
+			# The known cells given to &motion.
 		"""
 		self._context_cursor = point
+		if origin is not None:
+			return self.motion(origin, point, overwrite)
 		return self.seek_absolute(self.translate(self.point, point))
 
 	def tell(self):
@@ -769,8 +1438,44 @@ class Screen(Context):
 	# Screens are given a slightly wider scope than &Context and provides
 	# access to some configuration options that are not always maintained
 	# for the duration of the process.
+
+	# [ Properties ]
+	# /synchronized/
+		# Whether &synchronize frames updates with the synchronized output private mode.
 	"""
 	point = core.Point((0,0))
+	right_edge = True
+	synchronized = False
+
+	def context_set_synchronized(self, synchronized:bool) -> 'Screen':
+		"""
+		# Designate whether &synchronize should frame updates with the
+		# synchronized output private mode. Usually configured using the result of
+		# &.control.synchronized_output.
+		"""
+		self.synchronized = synchronized
+		return self
+
+	def begin_synchronized_update(self):
+		"""
+		# Instruct the emulator to defer painting until &end_synchronized_update.
+		"""
+		return self.terminal_type.begin_synchronized_update
+
+	def end_synchronized_update(self):
+		"""
+		# Instruct the emulator to paint the updates made since &begin_synchronized_update.
+		"""
+		return self.terminal_type.end_synchronized_update
+
+	def synchronize(self, frame:bytes) -> bytes:
+		"""
+		# Surround &frame with &begin_synchronized_update and &end_synchronized_update
+		# when the screen is configured to be &synchronized and &frame is not empty.
+		"""
+		if not frame or not self.synchronized:
+			return frame
+		return self.begin_synchronized_update() + frame + self.end_synchronized_update()
 
 	def set_window_title_text(self, title):
 		"""
@@ -783,37 +1488,37 @@ class Screen(Context):
 		"""
 		# Request that the terminal report the cursor position.
 		"""
-		return self._csi(b"n", b"6")
+		return self.terminal_type.request_cursor_position
 
 	def report_device_status(self):
 		"""
 		# Request that the terminal report status.
 		"""
-		return self._csi(b"n", b"5")
+		return self.terminal_type.request_device_status
 
 	def set_cursor_visible(self, visible):
 		"""
 		# Adjust cursor visibility.
 		"""
 		if visible:
-			return self.terminal_type.decset((25,))
+			return self.terminal_type.show_cursor
 		else:
-			return self.terminal_type.decrst((25,))
+			return self.terminal_type.hide_cursor
 
 	def set_cursor_blink(self, blinking):
 		"""
 		# Adjust cursor blink state.
 		"""
 		if blinking:
-			return self.terminal_type.decset((12,))
+			return self.terminal_type.start_cursor_blink
 		else:
-			return self.terminal_type.decrst((12,))
+			return self.terminal_type.stop_cursor_blink
 
 	def reset(self):
 		"""
 		# Construct a soft terminal reset.
 		"""
-		return self._csi(b'!p')
+		return self.terminal_type.soft_reset
 
 	def set_scrolling_region(self, top, bottom):
 		"""
@@ -825,7 +1530,7 @@ class Screen(Context):
 		"""
 		# Set the scrolling region to the entire screen.
 		"""
-		return self._csi(b'r')
+		return self.terminal_type.reset_scrolling_region
 
 	def open_scrolling_region(self, top:int, bottom:int):
 		"""
@@ -833,9 +1538,9 @@ class Screen(Context):
 		# Subsequent &exit_scrolling_region and &enter_scrolling_region
 		# should be use to maintain the SR's state.
 		"""
+		ttype = self.terminal_type
 		sr = self.set_scrolling_region(top, bottom)
-		en = self.terminal_type.decset((self.terminal_type._pm_origin,))
-		return self.store_cursor_location() + sr + en + self.restore_cursor_location()
+		return ttype.store_cursor + sr + ttype.enter_origin_mode + ttype.restore_cursor
 
 	def close_scrolling_region(self):
 		"""
@@ -843,22 +1548,22 @@ class Screen(Context):
 		# This preserves the screen's state after the transition.
 		"""
 		ttype = self.terminal_type
-		return self.store_cursor_location() + ttype.decset((ttype._pm_screen,)) + \
-			self.reset_scrolling_region() + \
-			ttype.decrst((ttype._pm_screen,)) + self.enter_scrolling_region()
+		return ttype.store_cursor + ttype.enter_alternate_screen + \
+			ttype.reset_scrolling_region + \
+			ttype.exit_alternate_screen + ttype.enter_origin_mode + ttype.restore_cursor
 
 	def store_cursor_location(self):
 		"""
 		# Emulator level cursor storage.
 		"""
-		return self._csi(b's')
+		return self.terminal_type.store_cursor
 		# VT: return self.terminal_type.esc(b'7')
 
 	def restore_cursor_location(self):
 		"""
 		# Restore a previously stored cursor location.
 		"""
-		return self._csi(b'u')
+		return self.terminal_type.restore_cursor
 		# VT: return self.terminal_type.esc(b'8')
 
 	def scroll_up(self, count):
@@ -887,17 +1592,16 @@ class Screen(Context):
 		"""
 		# Enter scrolling region; normal terminal output; restores cursor location.
 		"""
-		return \
-			self.terminal_type.decset((self.terminal_type._pm_origin,)) + \
-			self.restore_cursor_location()
+		ttype = self.terminal_type
+		return ttype.enter_origin_mode + ttype.restore_cursor
 
 	def exit_scrolling_region(self):
 		"""
 		# Exit scrolling region; allow out of region printing; saves cursor location.
 		"""
-		return \
-			self.store_cursor_location() + \
-			self.terminal_type.decrst((self.terminal_type._pm_origin,))
+		ttype = self.terminal_type
+		return ttype.store_cursor + ttype.exit_origin_mode
 
 	def clear(self):
-		return self.reset_text() + self._csi(b'H') + self._csi(b'2J')
+		ttype = self.terminal_type
+		return self.reset_text() + ttype.cursor_home + ttype.clear_screen
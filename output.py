@@ -0,0 +1,325 @@
+"""
+# Output management for terminal devices.
+
+# &Sink gathers the sequences constructed by &.matrix and &.frame and writes them to the
+# terminal's file descriptor with &os.writev, allowing applications to issue a single system
+# call for many sequences. &.control.setup uses a &Sink for the preparation and restoration
+# sequences, and applications may provide their own in order to share it with renderers.
+
+# &AsyncSink writes frames to a non-blocking terminal file descriptor from an &asyncio
+# event loop so that slow devices do not stall the loop.
+"""
+import os
+import select
+import typing
+import asyncio
+
+def _iov_max(default=1024):
+	try:
+		n = os.sysconf('SC_IOV_MAX')
+	except (AttributeError, ValueError, OSError):
+		return default
+	return n if n > 0 else default
+
+class Sink(object):
+	"""
+	# Coalescing writer for a terminal file descriptor.
+
+	# Sequences given to &write are retained until &flush is called, which writes them
+	# in batches of, at most, &batch buffers per system call. Partial writes are resumed,
+	# and when the file descriptor is non-blocking, &select.poll is used to wait
+	# for the device to become writable.
+
+	# [ Properties ]
+	# /fileno/
+		# The file descriptor written to.
+	# /batch/
+		# The maximum number of buffers given to a single &os.writev call.
+	# /timeout/
+		# The number of milliseconds to wait for the device to become writable.
+		# &None waits indefinitely.
+	# /flushed/
+		# Pair of the number of bytes written and the number of system calls
+		# performed by the last &flush.
+	# /total/
+		# Pair of the number of bytes written and the number of system calls
+		# performed by all flushes.
+	"""
+
+	def __init__(self, fileno:int, batch:int=None, timeout:int=None):
+		self.fileno = fileno
+		self.batch = batch or _iov_max()
+		self.timeout = timeout
+		self.flushed = (0, 0)
+		self.total = (0, 0)
+		self._pending = []
+		self._poll = None
+
+	def __len__(self):
+		"""
+		# The number of bytes waiting to be written.
+		"""
+		return sum(map(len, self._pending))
+
+	def write(self, data:bytes):
+		"""
+		# Enqueue &data to be written by the next &flush.
+		"""
+		if data:
+			self._pending.append(data)
+		return self
+
+	def extend(self, sequences:typing.Iterable[bytes]):
+		"""
+		# Enqueue all the &sequences to be written by the next &flush.
+		"""
+		self._pending.extend(x for x in sequences if x)
+		return self
+
+	def discard(self):
+		"""
+		# Forget any sequences that have not been written.
+		"""
+		self._pending = []
+		return self
+
+	def _wait(self):
+		# Wait for the device to become writable; False on timeout.
+		if self._poll is None:
+			self._poll = select.poll()
+			self._poll.register(self.fileno, select.POLLOUT)
+		return bool(self._poll.poll(self.timeout))
+
+	def flush(self, limit:int=None) -> typing.Tuple[int, int]:
+		"""
+		# Write the enqueued sequences to the device.
+
+		# [ Parameters ]
+		# /limit/
+			# The maximum number of system calls to perform. When reached,
+			# the unwritten sequences remain enqueued.
+
+		# [ Returns ]
+		# Pair of the number of bytes written and the number of system calls.
+		"""
+		views = [memoryview(x) for x in self._pending]
+		index = 0
+		written = 0
+		calls = 0
+		fd = self.fileno
+		writev = os.writev
+
+		try:
+			while index < len(views):
+				if limit is not None and calls >= limit:
+					break
+
+				try:
+					n = writev(fd, views[index:index+self.batch])
+				except BlockingIOError:
+					if not self._wait():
+						break
+					continue
+
+				calls += 1
+				written += n
+
+				# Advance past the written buffers.
+				while n:
+					v = views[index]
+					if n >= len(v):
+						n -= len(v)
+						index += 1
+					else:
+						views[index] = v[n:]
+						n = 0
+		finally:
+			self._pending = views[index:]
+			self.flushed = (written, calls)
+			self.total = (self.total[0] + written, self.total[1] + calls)
+
+		return self.flushed
+
+class AsyncSink(object):
+	"""
+	# &asyncio writer for a terminal file descriptor.
+
+	# The file descriptor is configured to be non-blocking, and frames are written as the
+	# device accepts them using (id)`loop.add_writer`. Frames given to &write that have not
+	# started to be written are merged into a single buffer. A frame that redraws the entire
+	# screen may be written with (id)`supersedes` in order to drop the merged frames, so that
+	# stale frames are not sent to a congested device. Producers apply backpressure
+	# by awaiting &drain, or by rendering a complete frame when &congested.
+
+	# Usually, constructed for the device returned by &.control.setup:
+
+	#!/pl/python
+		ttydevice, prepare, restore = control.setup()
+		sink = output.AsyncSink(ttydevice.fileno())
+
+	# &drain should be awaited with a limit of zero before restoring the terminal.
+
+	# When writing fails with an &OSError other than &BlockingIOError, the device is no longer
+	# written to, the buffered frames are discarded, and the exception is raised by the pending
+	# and subsequent &drain calls and by subsequent &write calls.
+
+	# [ Properties ]
+	# /fileno/
+		# The file descriptor written to.
+	# /limit/
+		# The number of buffered bytes beyond which the sink is &congested.
+	# /written/
+		# The number of bytes written.
+	# /dropped/
+		# The number of bytes discarded by superseding frames.
+	# /peak/
+		# The largest number of bytes buffered.
+	"""
+
+	def __init__(self, fileno:int, loop:asyncio.AbstractEventLoop=None, limit:int=0x10000):
+		self.fileno = fileno
+		self.loop = loop if loop is not None else asyncio.get_running_loop()
+		self.limit = limit
+		self.written = 0
+		self.dropped = 0
+		self.peak = 0
+
+		self._blocking = os.get_blocking(fileno)
+		os.set_blocking(fileno, False)
+
+		self._active = None # Partially written frame; never dropped.
+		self._merged = bytearray()
+		self._registered = False
+		self._waiters = []
+		self._exception = None
+
+	@property
+	def buffered(self) -> int:
+		"""
+		# The number of bytes waiting to be written.
+		"""
+		return (len(self._active) if self._active is not None else 0) + len(self._merged)
+
+	@property
+	def congested(self) -> bool:
+		"""
+		# Whether more than &limit bytes are waiting to be written.
+		"""
+		return self.buffered > self.limit
+
+	def write(self, frame:bytes, supersedes:bool=False):
+		"""
+		# Enqueue &frame to be written.
+
+		# [ Parameters ]
+		# /supersedes/
+			# Whether &frame replaces the effects of the frames that have not started
+			# to be written; those frames are dropped.
+		"""
+		if self._exception is not None:
+			raise self._exception
+
+		if supersedes and self._merged:
+			self.dropped += len(self._merged)
+			self._merged = bytearray()
+
+		self._merged += frame
+		n = self.buffered
+		if n > self.peak:
+			self.peak = n
+
+		if not self._registered:
+			self._ready()
+
+	def _ready(self):
+		# Write until the device is saturated or nothing remains.
+		fd = self.fileno
+		while True:
+			if self._active is None:
+				if not self._merged:
+					break
+				self._active = memoryview(bytes(self._merged))
+				self._merged = bytearray()
+
+			try:
+				n = os.write(fd, self._active)
+			except BlockingIOError:
+				n = 0
+			except OSError as err:
+				self._fail(err)
+				return
+
+			self.written += n
+			if n < len(self._active):
+				self._active = self._active[n:]
+				if not self._registered:
+					self.loop.add_writer(fd, self._ready)
+					self._registered = True
+				break
+			self._active = None
+
+		if self._registered and self._active is None and not self._merged:
+			self.loop.remove_writer(fd)
+			self._registered = False
+
+		self._wake()
+
+	def _fail(self, exception):
+		# Stop writing and propagate &exception to the &drain futures.
+		if self._registered:
+			self.loop.remove_writer(self.fileno)
+			self._registered = False
+
+		self._active = None
+		self._merged = bytearray()
+		self._exception = exception
+		for limit, future in self._waiters:
+			if not future.done():
+				future.set_exception(exception)
+		self._waiters = []
+
+	def _wake(self):
+		# Resolve the &drain futures whose limits are satisfied.
+		n = self.buffered
+		waiting = []
+		for limit, future in self._waiters:
+			if future.done():
+				continue
+			if n <= limit:
+				future.set_result(None)
+			else:
+				waiting.append((limit, future))
+		self._waiters = waiting
+
+	async def drain(self, limit:int=None):
+		"""
+		# Wait until no more than &limit bytes are buffered; defaults to &self.limit.
+		"""
+		if self._exception is not None:
+			raise self._exception
+
+		if limit is None:
+			limit = self.limit
+		if self.buffered <= limit:
+			return
+
+		future = self.loop.create_future()
+		self._waiters.append((limit, future))
+		await future
+
+	def close(self):
+		"""
+		# Stop writing, discard the buffered frames, and restore the blocking state of the descriptor.
+		"""
+		if self._registered:
+			self.loop.remove_writer(self.fileno)
+			self._registered = False
+
+		self._active = None
+		self._merged = bytearray()
+		for limit, future in self._waiters:
+			if not future.done():
+				future.cancel()
+		self._waiters = []
+
+		os.set_blocking(self.fileno, self._blocking)
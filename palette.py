@@ -342,6 +342,82 @@ def index():
 	)))
 	return idx
 
+# The default RGB values of tty-16 used by xterm.
+# Used to approximate colors when quantizing to tty-16.
+tty16_rgb = (
+	0x000000, 0xcd0000, 0x00cd00, 0xcdcd00, 0x0000ee, 0xcd00cd, 0x00cdcd, 0xe5e5e5,
+	0x7f7f7f, 0xff0000, 0x00ff00, 0xffff00, 0x5c5cff, 0xff00ff, 0x00ffff, 0xffffff,
+)
+
+def xterm_rgb(code:int) -> int:
+	"""
+	# The 24-bit RGB value of the xterm-256 color &code.
+	"""
+	if code < 16:
+		return tty16_rgb[code]
+	elif code < 232:
+		code -= 16
+		return color_palette(code // 36, (code // 6) % 6, code % 6)[0]
+	else:
+		return gray_palette(code - 232)[0]
+
+# The components of every xterm-256 code; used to measure distances.
+_xterm_components = tuple(
+	((v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF)
+	for v in map(xterm_rgb, range(256))
+)
+
+def nearest(rgb:int, codes, components=_xterm_components) -> int:
+	"""
+	# Select the xterm-256 color code from &codes whose RGB value is closest to &rgb.
+	"""
+	r, g, b = (rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF
+
+	def distance(code):
+		cr, cg, cb = components[code]
+		return ((cr - r) ** 2) + ((cg - g) ** 2) + ((cb - b) ** 2)
+
+	return min(codes, key=distance)
+
+def _cube_index(v):
+	# The nearest of the cube's levels, 0, 95, 135, 175, 215, and 255; ties select the lower.
+	if v < 48:
+		return 0
+	elif v <= 115:
+		return 1
+	return (v - 36) // 40
+
+def quantize_256(rgb:int, components=_xterm_components) -> int:
+	"""
+	# Select the closest xterm-256 color code for the 24-bit &rgb value.
+
+	# The nearest color of the 6x6x6 cube and the nearest step of the gray ramp are
+	# calculated directly and the closer of the two is selected; the cube is preferred
+	# when they are equally distant.
+	# The tty-16 codes are not considered as their values are often changed by themes.
+	"""
+	r, g, b = (rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF
+	cube = 16 + (_cube_index(r) * 36) + (_cube_index(g) * 6) + _cube_index(b)
+
+	# The nearest gray is the step closest to the mean of the components.
+	step = (r + g + b - 10) // 30
+	gray = 232 + (0 if step < 0 else 23 if step > 23 else step)
+
+	cr, cg, cb = components[cube]
+	gv = components[gray][0]
+	if ((gv - r) ** 2) + ((gv - g) ** 2) + ((gv - b) ** 2) < ((cr - r) ** 2) + ((cg - g) ** 2) + ((cb - b) ** 2):
+		return gray
+	return cube
+
+def quantize_16(rgb:int) -> int:
+	"""
+	# Select the closest tty-16 color code for the 24-bit &rgb value.
+	"""
+	return nearest(rgb, range(16))
+
+# The closest tty-16 code of every xterm-256 code; tty-16 codes map to themselves.
+tty16_reduction = tuple(range(16)) + tuple(quantize_16(xterm_rgb(i)) for i in range(16, 256))
+
 if __name__ == '__main__':
 	import sys
 	from . import matrix
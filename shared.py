@@ -0,0 +1,209 @@
+"""
+# Shared memory transfer of &core.Page instances between processes.
+
+# &publish writes a page into a &multiprocessing.shared_memory.SharedMemory segment using
+# a compact, fixed layout, and &attach constructs a read-only &SharedPage view of a segment
+# published by another process. &SharedPage only decodes the lines that are accessed, so a
+# &..matrix.Context.print of a window of the page does not deserialize every word.
+
+# [ Layout ]
+
+# The segment consists of a header followed by four native-endian arrays and the text:
+
+# # Header; magic, phrase count, word count, and text size.
+# # Phrase word offsets; (id)`q` array of phrase count plus one entries.
+# # Word text end offsets; (id)`q` array with an entry per word.
+# # Phrase cell counts; (id)`i` array with an entry per phrase.
+# # Word fields; (id)`i` array with cells, text color, cell color, and traits per word.
+# # The text of every word encoded as UTF-8.
+
+# [ Engineering ]
+# &core.Units words are transferred as &str and &None colors are represented with
+# a sentinel; &Phrase instances using other types in their words cannot be published.
+
+# Before Python 3.13, attaching registers the segment with the reader's resource tracker
+# which unlinks it when the reader exits. &attach unregisters the segment unless it was
+# published by the attaching process, which shares the publisher's registration.
+"""
+import array
+import struct
+import typing
+import weakref
+import collections.abc
+from multiprocessing import shared_memory
+from multiprocessing import resource_tracker
+
+from . import core
+
+_header = struct.Struct('=4sqqq')
+_magic = b'PAGE'
+_none = -0x80000000 # Representation of None colors and traits.
+_fields = 4
+_encoding = 'utf-8'
+_errors = 'surrogatepass'
+
+# Segments created by &publish in this process; keyed by name.
+_published = weakref.WeakValueDictionary()
+
+def _layout(nphrases, nwords, textsize):
+	# Offsets of the arrays and the total size of the segment.
+	offsets = _header.size
+	ends = offsets + (8 * (nphrases + 1))
+	cellcounts = ends + (8 * nwords)
+	fields = cellcounts + (4 * nphrases)
+	text = fields + (4 * _fields * nwords)
+	return offsets, ends, cellcounts, fields, text, text + textsize
+
+def _integer(value, none=_none):
+	return none if value is None else int(value)
+
+def publish(page:core.Page, name:str=None) -> shared_memory.SharedMemory:
+	"""
+	# Copy the &page into a new shared memory segment.
+
+	# The returned segment is owned by the caller; it must be closed and unlinked
+	# once the readers have detached. The segment's (id)`name` should be sent to the
+	# reading process for use with &attach.
+	"""
+	offsets = [0]
+	ends = []
+	cellcounts = []
+	fields = []
+	texts = []
+	position = 0
+
+	for phrase in page:
+		cc = 0
+		for cells, text, rp in phrase:
+			etext = str(text).encode(_encoding, _errors)
+			position += len(etext)
+			texts.append(etext)
+			ends.append(position)
+			cc += cells
+			fields.extend((cells, _integer(rp[0]), _integer(rp[1]), _integer(rp[2])))
+		offsets.append(len(ends))
+		cellcounts.append(cc)
+
+	layout = _layout(len(cellcounts), len(ends), position)
+	shm = shared_memory.SharedMemory(name=name, create=True, size=max(layout[-1], 1))
+	buf = shm.buf
+	try:
+		_header.pack_into(buf, 0, _magic, len(cellcounts), len(ends), position)
+		for start, stop, fmt, values in zip(layout, layout[1:], 'qqii', (offsets, ends, cellcounts, fields)):
+			buf[start:stop].cast(fmt)[:] = memoryview(array.array(fmt, values))
+		buf[layout[-2]:layout[-1]] = b''.join(texts)
+	except BaseException:
+		shm.close()
+		shm.unlink()
+		raise
+
+	_published[shm.name] = shm
+	return shm
+
+class SharedPage(collections.abc.Sequence):
+	"""
+	# Read-only &core.Page view of a shared memory segment written by &publish.
+
+	# Indexing constructs the &core.Phrase of the line on demand; the &RenderParameters
+	# of the words are interned by the view so repeated styles share instances.
+	"""
+
+	def __init__(self, shm:shared_memory.SharedMemory, Phrase=core.Phrase):
+		self.shm = shm
+		self.Phrase = Phrase
+		self._rparams = {}
+
+		buf = self._buffer = memoryview(shm.buf).toreadonly()
+		magic, nphrases, nwords, textsize = _header.unpack_from(buf, 0)
+		if magic != _magic:
+			buf.release()
+			raise ValueError("shared memory segment does not contain a published page")
+
+		layout = _layout(nphrases, nwords, textsize)
+		self._offsets, self._ends, self._cellcounts, self._fields = [
+			buf[start:stop].cast(fmt)
+			for start, stop, fmt in zip(layout, layout[1:], 'qqii')
+		]
+		self._text = buf[layout[-2]:layout[-1]]
+
+	def __len__(self):
+		return len(self._cellcounts)
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self)))]
+
+		offsets = self._offsets
+		if index < 0:
+			index += len(self)
+		if index < 0 or index >= len(self):
+			raise IndexError(index)
+
+		return self.Phrase(self._words(offsets[index], offsets[index+1]))
+
+	def _words(self, start, stop,
+			none=_none, Traits=core.Traits, RenderParameters=core.RenderParameters,
+			str=str, bytes=bytes
+		):
+		fields = self._fields
+		ends = self._ends
+		text = self._text
+		interned = self._rparams
+
+		tstart = ends[start-1] if start else 0
+		for i in range(start, stop):
+			f = i * _fields
+			cells, key = fields[f], (fields[f+1], fields[f+2], fields[f+3])
+			rp = interned.get(key)
+			if rp is None:
+				tc, cc, tr = key
+				rp = interned[key] = RenderParameters((
+					None if tc == none else tc,
+					None if cc == none else cc,
+					None if tr == none else Traits(tr),
+				))
+
+			tstop = ends[i]
+			yield (cells, str(bytes(text[tstart:tstop]), _encoding, _errors), rp)
+			tstart = tstop
+
+	def cellcounts(self) -> typing.Sequence[int]:
+		"""
+		# The cell counts of the phrases; suitable for use with &..matrix.Context.print.
+		"""
+		return self._cellcounts
+
+	def close(self):
+		"""
+		# Release the views of the segment and close the segment.
+		"""
+		for x in (self._offsets, self._ends, self._cellcounts, self._fields, self._text, self._buffer):
+			x.release()
+		self.shm.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+def attach(name:str) -> SharedPage:
+	"""
+	# Attach to the page published by &publish with the segment &name.
+
+	# The segment is not unlinked when the view is closed; the publishing process
+	# retains ownership.
+	"""
+	try:
+		shm = shared_memory.SharedMemory(name=name, track=False)
+	except TypeError:
+		# track was introduced in 3.13; cancel the registration made by the reader.
+		shm = shared_memory.SharedMemory(name=name)
+		if shm.name not in _published:
+			resource_tracker.unregister(shm._name, 'shared_memory')
+
+	try:
+		return SharedPage(shm)
+	except BaseException:
+		shm.close()
+		raise
@@ -0,0 +1,120 @@
+"""
+# - &.compositor
+"""
+from .. import core
+from .. import matrix
+from .. import compositor as module
+
+normal = core.RenderParameters((-1024, -1024, core.NoTraits))
+red = core.RenderParameters((-513, -1024, core.NoTraits))
+
+def phrase(*words):
+	return core.Phrase(
+		(len(t), t, rp) for t, rp in words
+	)
+
+def text(phrase):
+	return ''.join(str(w[1]) for w in phrase)
+
+def setup(width=12, height=4):
+	s = matrix.Screen()
+	s.context_set_dimensions((width, height))
+	c = module.Compositor(s)
+
+	base = matrix.Context()
+	base.context_set_position((0, 0))
+	base.context_set_dimensions((width, height))
+	return s, c, base
+
+def popup(point, dimensions):
+	ctx = matrix.Context()
+	ctx.context_set_position(point)
+	ctx.context_set_dimensions(dimensions)
+	return ctx
+
+def test_crop(test):
+	"""
+	# - &module.crop
+	"""
+	p = phrase(("abcdef", normal), ("ghij", red))
+	test/text(module.crop(p, 10, 0, 10)) == "abcdefghij"
+	test/text(module.crop(p, 10, 2, 8)) == "cdefgh"
+	test/text(module.crop(p, 10, 10, 12)) == ""
+	test/text(module.crop(p, 10, 8, 12)) == "ij"
+
+	# Torn wide characters are replaced with spaces.
+	w = core.Phrase([(4, "謝了", normal)])
+	test/text(module.crop(w, 4, 1, 4)) == " 了"
+	test/text(module.crop(w, 4, 0, 3)) == "謝 "
+
+def test_Compositor_occlusion(test):
+	"""
+	# - &module.Compositor.compose
+	"""
+	s, c, base = setup()
+	lower = c.insert(base, 0)
+	upper = c.insert(popup((2, 1), (5, 2)), 1)
+	c.update(lower, [phrase(("0123456789ab", normal))] * 4)
+	c.update(upper, [phrase(("pop", red))])
+
+	test/text(c.compose(0)) == "0123456789ab"
+	test/text(c.compose(1)) == "01pop  789ab"
+	test/text(c.compose(2)) == "01     789ab"
+	test/c.compose(1)[1] == (3, "pop", red)
+
+	# Hidden layers are not composed.
+	c.set_visible(upper, False)
+	test/text(c.compose(1)) == "0123456789ab"
+
+	# Orders are respected regardless of insertion.
+	c.set_visible(upper, True)
+	c.insert(popup((0, 1), (4, 1)), 2)
+	test/text(c.compose(1)) == "    p  789ab"
+
+	# Trailing blanks of the screen's colors are left to the renderer.
+	s, c, base = setup()
+	lower = c.insert(base, 0)
+	c.update(lower, [phrase(("abc", normal))])
+	test/text(c.compose(0)) == "abc"
+
+def test_Compositor_frame(test):
+	"""
+	# - &module.Compositor.frame
+
+	# Validate that only the visible cells of changed layers are emitted.
+	"""
+	s, c, base = setup()
+	lower = c.insert(base, 0)
+	upper = c.insert(popup((2, 1), (5, 2)), 1)
+	c.update(lower, [phrase(("0123456789ab", normal))] * 4)
+	c.update(upper, [phrase(("pop", red))])
+	c.frame()
+	test/c._dirty == set()
+
+	# Occluded changes are not emitted.
+	c.update(lower, [phrase(("0123456789ab", normal))] + [phrase(("01xxx56789ab", normal))] + [phrase(("0123456789ab", normal))] * 2)
+	test/c._dirty == {1}
+	test/c.frame() == b''
+
+	# Visible changes are.
+	c.update(upper, [phrase(("top", red))])
+	out = c.frame()
+	test/out == s.seek_absolute((2, 1)) + b'\x1b[31mt'
+
+	# Removal exposes the lower layer.
+	c.remove(upper)
+	test/c._dirty == {1, 2}
+	out = c.frame()
+	b'xxx56' in test/out
+	b'23456' in test/out
+	test/text(c.renderer.shadow[1]) == "01xxx56789ab"
+
+	# Moving damages the former and new areas.
+	c.insert(upper.context, 1)
+	c.frame()
+	c.move(c.layers[-1], point=(2, 3))
+	test/c._dirty == {1, 2, 3}
+
+if __name__ == '__main__':
+	import sys; from ...test import library as libtest
+	libtest.execute(sys.modules[__name__])
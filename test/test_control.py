@@ -0,0 +1,84 @@
+"""
+# - &.control
+"""
+import os
+from .. import control as module
+
+class Device(object):
+	def __init__(self, fd):
+		self.fd = fd
+
+	def fileno(self):
+		return self.fd
+
+def pty():
+	import tty
+	master, slave = os.openpty()
+	tty.setraw(slave)
+	return master, slave
+
+def test_query_private_mode(test):
+	"""
+	# - &module.query_private_mode
+	"""
+	master, slave = pty()
+	try:
+		# Prepare the report before the query; noise preceding it is discarded.
+		os.write(master, b'x\x1b[?2026;2$y')
+		test/module.query_private_mode(Device(slave), 'synchronized-output') == 'reset'
+		test/os.read(master, 64) == b'\x1b[?2026$p'
+
+		os.write(master, b'\x1b[?2004;0$y')
+		test/module.query_private_mode(Device(slave), 'bracket-paste-mode') == 'not-recognized'
+		os.read(master, 64)
+
+		# No response.
+		test/module.query_private_mode(Device(slave), 'synchronized-output', timeout=0.01) == None
+	finally:
+		os.close(master)
+		os.close(slave)
+
+def test_synchronized_output(test):
+	"""
+	# - &module.synchronized_output
+	"""
+	master, slave = pty()
+	try:
+		device = Device(slave)
+		os.write(master, b'\x1b[?2026;1$y')
+		test/module.synchronized_output(device) == True
+		os.read(master, 64)
+
+		# Cached; no query performed.
+		test/module.synchronized_output(device, timeout=0.01) == True
+
+		# Distinct device objects using the same descriptor are queried.
+		test/module.synchronized_output(Device(slave), timeout=0.01) == False
+		os.read(master, 64)
+
+		os.write(master, b'\x1b[?2026;4$y')
+		test/module.synchronized_output(device, refresh=True) == False
+		test/module.synchronized_output(device, timeout=0.01) == False
+	finally:
+		os.close(master)
+		os.close(slave)
+
+	master, slave = pty()
+	try:
+		device = Device(slave)
+		device.path = os.ttyname(slave)
+		os.write(master, b'\x1b[?2026;2$y')
+		test/module.synchronized_output(device) == True
+
+		# Cached by path.
+		reopened = Device(slave)
+		reopened.path = device.path
+		test/module.synchronized_output(reopened, timeout=0.01) == True
+	finally:
+		module._synchronized_output_support.pop(device.path, None)
+		os.close(master)
+		os.close(slave)
+
+if __name__ == '__main__':
+	import sys; from ...test import library as libtest
+	libtest.execute(sys.modules[__name__])
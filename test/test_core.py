@@ -650,6 +650,133 @@ def test_Constructors(test):
 	)
 	test/"".join([str(x[1]) for x in ph]) == "Former sentence->Latter sentence;"
 
+def test_Phrase_fit_pad(test):
+	"""
+	# - &module.Phrase.fit
+	"""
+	rp = module.RenderParameters((1, 2, module.Traits.construct('underline')))
+	pp = module.RenderParameters((1, 2, notraits))
+	ph = module.Phrase(rp.form("text"))
+
+	test/ph.fit(4) == ph
+	test/ph.fit(6) == ((4, "text", rp), (2, "  ", pp))
+	test/ph.fit(6, align='right') == ((2, "  ", pp), (4, "text", rp))
+	test/ph.fit(7, align='center') == ((1, " ", pp), (4, "text", rp), (2, "  ", pp))
+	test/ph.fit(6, padding=rp)[-1] == (2, "  ", rp)
+	test/ValueError ^ (lambda: ph.fit(6, align='top'))
+
+	empty = module.Phrase(())
+	test/empty.fit(2).cellcount() == 2
+	test/empty.fit(0) == empty
+
+def test_Phrase_fit_truncate(test):
+	"""
+	# - &module.Phrase.fit
+	"""
+	first = module.RenderParameters((1, 2, notraits))
+	second = module.RenderParameters((3, 4, notraits))
+	ph = module.Phrase(list(first.form("prefix")) + list(second.form("-suffix")))
+
+	test/ph.fit(8) == ((6, "prefix", first), (1, "-", second), (1, "\u2026", second))
+	test/ph.fit(7) == ((6, "prefix", first), (1, "\u2026", second))
+	test/ph.fit(5) == ((4, "pref", first), (1, "\u2026", first))
+	test/ph.fit(5, ellipsis='') == ((5, "prefi", first),)
+	test/ph.fit(5, ellipsis='...') == ((2, "pr", first), (3, "...", first))
+
+	# Ellipsis larger than the width is dropped.
+	test/ph.fit(2, ellipsis='...') == ((2, "pr", first),)
+	test/ph.fit(0).cellcount() == 0
+
+	for i in range(16):
+		test/ph.fit(i).cellcount() == i
+
+def test_Phrase_fit_wide(test):
+	"""
+	# - &module.Phrase.fit
+
+	# Failure is likely due to a malfunctioning &wcswidth implementation.
+	"""
+	ph = module.Phrase.construct([("謝了春", -1024, -1024, notraits)])
+	rp = ph[0][2]
+
+	test/ph.fit(6) == ph
+	test/ph.fit(5) == ((4, "謝了", rp), (1, "\u2026", rp))
+	test/ph.fit(4) == ((2, "謝", rp), (1, " ", rp), (1, "\u2026", rp))
+	test/ph.fit(2) == ((1, " ", rp), (1, "\u2026", rp))
+
+	for i in range(10):
+		test/ph.fit(i).cellcount() == i
+
+def test_Phrase_controls(test):
+	"""
+	# - &module.cells
+	# - &module.Phrase.construct
+	# - &module.Phrase.rstripcells
+	# - &module.Phrase.lstripcells
+	# - &module.Phrase.fit
+
+	# Control characters are counted as the cells of their replacement glyphs.
+	"""
+	test/module.cells("abc") == 3
+	test/module.cells("a\x1bb") == 3
+	test/module.cells("\t\x7f\x9b") == 3
+	test/module.cells(module.Units(("\x07",))) == 1
+	test/module.control_mapping['\x1b'] == '\u241b'
+	test/module.control_mapping['\x85'] == '\u2426'
+
+	ph = module.Phrase.construct([("abc\x01\x01\x01defghij", -1024, -1024, notraits)])
+	rp = ph[0][2]
+	test/ph.cellcount() == 13
+	test/ph.rstripcells(3) == ((10, "abc\x01\x01\x01defg", rp),)
+	test/ph.lstripcells(4) == ((9, "\x01\x01defghij", rp),)
+	test/ph.fit(5) == ((4, "abc\x01", rp), (1, "\u2026", rp))
+
+	for i in range(16):
+		test/ph.fit(i).cellcount() == i
+
+def test_PhraseBuilder(test):
+	"""
+	# - &module.PhraseBuilder
+	"""
+	first = module.RenderParameters((1, 2, notraits))
+	second = module.RenderParameters((3, 4, notraits))
+
+	b = module.PhraseBuilder()
+	test/b.freeze() == ()
+	test/len(b) == 0
+
+	b.extend(first.form("pre", "fix"))
+	test/len(b) == 1
+	b.add("-", second)
+	b.append((6, "suffix", second))
+	test/b.cellcount == 13
+	test/len(b) == 2
+
+	ph = b.freeze()
+	test.isinstance(ph, module.Phrase)
+	test/ph == ((6, "prefix", first), (7, "-suffix", second))
+	test/ph.cellcount() == b.cellcount
+
+	# Continued use after freeze.
+	b.add("!", second)
+	test/b.freeze() == ((6, "prefix", first), (7, "-suffix", second), (1, "!", second))
+
+def test_PhraseBuilder_units(test):
+	"""
+	# - &module.PhraseBuilder.append
+
+	# Units are never merged with neighbors.
+	"""
+	rp = module.RenderParameters((1, 2, notraits))
+	u = (1, module.Units(("->",)), rp)
+
+	b = module.PhraseBuilder()
+	b.add("x", rp)
+	b.append(u)
+	b.add("y", rp)
+	b.add("z", rp)
+	test/b.freeze() == ((1, "x", rp), u, (2, "yz", rp))
+
 if __name__ == '__main__':
 	import sys; from ...test import library as libtest
 	libtest.execute(sys.modules[__name__])
@@ -0,0 +1,275 @@
+"""
+# - &.emulator
+"""
+from .. import core
+from .. import matrix
+from .. import frame
+from .. import emulator as module
+
+normal = core.RenderParameters((-1024, -1024, core.NoTraits))
+red = core.RenderParameters((-513, -1024, core.NoTraits))
+blue = core.RenderParameters((0x0000ff, -1024, core.Traits.construct('bold')))
+
+def phrase(*words):
+	return core.Phrase.construct(
+		(t,) + tuple(rp) for t, rp in words
+	)
+
+def screen(width, height):
+	s = matrix.Screen()
+	s.context_set_dimensions((width, height))
+	return s
+
+def test_Emulator_text(test):
+	"""
+	# - &module.Emulator.feed
+	# - &module.Emulator.text
+	"""
+	e = module.Emulator(10, 3)
+	e.feed(b'hello')
+	test/e.text()[0] == 'hello     '
+	test/e.cursor == (5, 0)
+
+	# Wrapping is pending after the last column.
+	e.feed(b'\x1b[1;6Hworld')
+	test/e.cursor == (9, 0)
+	e.feed(b'!')
+	test/e.text()[:2] == ['helloworld', '!         ']
+
+	# Incomplete sequences are retained.
+	e.feed(b'\x1b[3')
+	e.feed(b';2H\xe8')
+	e.feed(b'\xac\x9d')
+	test/e.text()[2] == ' 謝       '
+	test/e.grid[2][2] == ('', module.normal)
+
+	# Combining characters join the previous cell.
+	e.feed(b'\x1b[3;5Ha\xcc\x81')
+	test/e.grid[2][4][0] == 'á'
+
+	# Overwriting half of a wide character clears the other half.
+	e.feed(b'\x1b[3;3Hx')
+	test/e.text()[2] == '  x á     '
+
+def test_Emulator_sgr(test):
+	"""
+	# - &module.Emulator.style
+	"""
+	e = module.Emulator(10, 1)
+	e.feed(b'\x1b[31;1ma\x1b[38;5;196;48;2;0;0;255mb\x1b[22;39mc\x1b[0md')
+	test/[c[1] for c in e.grid[0][:4]] == [
+		(('tty-16', 1), None, frozenset({'bold'})),
+		(('xterm-256', 196), ('rgb', 0, 0, 255), frozenset({'bold'})),
+		(None, ('rgb', 0, 0, 255), frozenset()),
+		module.normal,
+	]
+
+	# Erasures use the cell color.
+	e.feed(b'\x1b[44m\x1b[1;2H\x1b[2X')
+	test/e.grid[0][1] == (' ', (None, ('tty-16', 4), frozenset()))
+	test/e.grid[0][3] == ('d', module.normal)
+
+def test_Emulator_edits(test):
+	"""
+	# - &module.Emulator.feed
+
+	# Erasures, repetitions, and character insertion and deletion.
+	"""
+	e = module.Emulator(8, 2)
+	e.feed(b'abcdefgh\x1b[2;1Habcdefgh')
+	e.feed(b'\x1b[1;3H\x1b[K')
+	test/e.text()[0] == 'ab      '
+	e.feed(b'\x1b[1;1H\x1b[2K')
+	test/e.text()[0] == '        '
+	e.feed(b'\x1b[2;4H\x1b[1K')
+	test/e.text()[1] == '    efgh'
+	e.feed(b'\x1b[2;5H\x1b[2@')
+	test/e.text()[1] == '      ef'
+	e.feed(b'\x1b[2;1H\x1b[3P')
+	test/e.text()[1] == '   ef   '
+	e.feed(b'\x1b[1;1Hx\x1b[3b')
+	test/e.text()[0] == 'xxxx    '
+	e.feed(b'\x1b[2J')
+	test/e.text() == [' ' * 8] * 2
+
+def test_Emulator_lines(test):
+	"""
+	# - &module.Emulator.feed
+
+	# Line insertion and deletion, scrolling, and the scrolling region.
+	"""
+	e = module.Emulator(4, 4)
+	e.feed(b'0\r\n1\r\n2\r\n3')
+	test/e.text() == ['0   ', '1   ', '2   ', '3   ']
+
+	e.feed(b'\x1b[2;1H\x1b[M')
+	test/e.text() == ['0   ', '2   ', '3   ', '    ']
+	e.feed(b'\x1b[L')
+	test/e.text() == ['0   ', '    ', '2   ', '3   ']
+
+	e.feed(b'\x1b[1;3r')
+	test/e.region == (0, 2)
+	e.feed(b'\x1b[S')
+	test/e.text() == ['    ', '2   ', '    ', '3   ']
+	e.feed(b'\x1b[2T')
+	test/e.text() == ['    ', '    ', '    ', '3   ']
+
+	# Line feed at the bottom of the region scrolls.
+	e.feed(b'\x1b[1;1Ha\x1b[3;1Hb\n')
+	test/e.text() == ['    ', 'b   ', '    ', '3   ']
+
+	e.feed(b'\x1b[r')
+	test/e.region == (0, 3)
+
+def test_Emulator_state(test):
+	"""
+	# - &module.Emulator.feed
+
+	# Cursor storage, private modes, titles, and requests.
+	"""
+	e = module.Emulator(10, 4)
+	e.feed(b'\x1b[2;3H\x1b[s\x1b[H\x1b[u')
+	test/e.cursor == (2, 1)
+
+	e.feed(b'\x1b[?25l\x1b[?2026h')
+	test/e.modes[25] == False
+	test/e.modes[2026] == True
+
+	e.feed(matrix.utf8_terminal_type.osc(b'2', b'title'))
+	test/e.title == 'title'
+	e.feed(b'\x1b]0;other\x07')
+	test/e.title == 'other'
+
+	e.feed(b'\x1b[6n' + matrix.utf8_terminal_type.decrqm(2026))
+	test/e.responses == [b'\x1b[2;3R', b'\x1b[?2026;1$y']
+
+	e.feed(b'\x1b[1;1Hmain\x1b[?1049hx\x1b[?1049l')
+	test/e.text()[0].startswith('main') == True
+	test/e.unrecognized == []
+
+def naive(s, page):
+	"""
+	# Construct the grid of a full redraw of &page.
+	"""
+	e = module.Emulator(s.width, s.height)
+	s.seek((0, 0))
+	e.feed(s.clear())
+	e.feed(s.seek_first())
+	page = list(page[:s.height])
+	page.extend([core.Phrase(())] * (s.height - len(page)))
+	page = [x.rstripcells(x.cellcount() - s.width) for x in page]
+	e.feed(b''.join(s.print(page, [x.cellcount() for x in page])))
+	return e.grid
+
+def frames(width=24, height=6):
+	"""
+	# A sequence of pages exercising the renderer's optimizations.
+	"""
+	lines = [phrase(("line %d: " %(i,), normal), ("value", red)) for i in range(12)]
+	yield lines[:6]
+
+	# Typing and deletion.
+	yield [phrase(("line 0: ", normal), ("vaXlue", red))] + lines[1:6]
+	yield [phrase(("line 0: ", normal), ("vaXYlue", red))] + lines[1:6]
+	yield [phrase(("line 0: ", normal), ("vlue", red))] + lines[1:6]
+
+	# Scrolling.
+	yield lines[1:7]
+	yield lines[3:9]
+	yield lines[2:8]
+
+	# Scrolling above a status line.
+	status = phrase(("status", blue))
+	yield lines[2:7] + [status]
+	yield lines[4:9] + [status]
+
+	# Shorter lines, wide characters, and colors.
+	yield [phrase(("謝了春紅", blue), ("x", normal))] + lines[4:8] + [status]
+	yield [phrase(("謝了", blue), ("y", red))] + lines[4:8] + [phrase()]
+	yield [phrase(("a" * (width + 4), red))] + [phrase(("b" * width, normal))] * 5
+	yield [phrase(("a", red))]
+	yield []
+
+def test_Renderer_equivalence(test):
+	"""
+	# - &frame.Renderer
+
+	# Validate that the renderer's output produces the same grid as full redraws.
+	"""
+	s = screen(24, 6)
+	r = frame.Renderer(s)
+	e = module.Emulator(24, 6)
+
+	for page in frames():
+		e.feed(r.frame(page))
+		test/e.grid == naive(s, page)
+	test/e.unrecognized == []
+
+def test_Renderer_equivalence_degraded(test):
+	"""
+	# - &frame.Renderer
+
+	# Equivalence using a xterm-256 terminal type.
+	"""
+	s = matrix.Screen(matrix.Type('utf-8', color_depth='xterm-256'))
+	s.context_set_dimensions((24, 6))
+	r = frame.Renderer(s)
+	e = module.Emulator(24, 6)
+
+	for page in frames():
+		e.feed(r.frame(page))
+		test/e.grid == naive(s, page)
+
+def test_Renderer_controls(test):
+	"""
+	# - &frame.Renderer
+	# - &core.cells
+
+	# Control characters in the text of words are displayed as single cell glyphs.
+	"""
+	s = screen(24, 4)
+	r = frame.Renderer(s)
+	e = module.Emulator(24, 4)
+	pages = [
+		[phrase(("log \x1b[2J data", normal)), phrase(("tab\there", red))],
+		[phrase(("log \x1b[2J Xdata", normal)), phrase(("tab\there\x9b", red))],
+		[phrase(("log \x1b[J Xdata", normal)), phrase(("\x07tab\there\x9b", red))],
+	]
+
+	for page in pages:
+		e.feed(r.frame(page))
+		test/e.grid == naive(s, page)
+
+	test/e.text()[0].rstrip() == 'log \u241b[J Xdata'
+	test/e.text()[1].rstrip() == '\u2407tab\u2409here\u2426'
+	test/e.responses == []
+	test/e.unrecognized == []
+
+def test_Renderer_controls_clip(test):
+	"""
+	# - &frame.Renderer
+	# - &core.Phrase.rstripcells
+
+	# Lines containing control characters wider than the screen are truncated
+	# at the cells of the replacement glyphs.
+	"""
+	s = screen(10, 2)
+	r = frame.Renderer(s)
+	e = module.Emulator(10, 2)
+	pages = [
+		[phrase(("abc\x01\x01\x01defghij", normal))],
+		[phrase(("abc", normal))],
+		[phrase(("\x1b" * 12, red)), phrase(("ab\x85", normal), ("\t" * 9, red))],
+		[phrase(("\x1b" * 11, red)), phrase(("ab", normal))],
+	]
+
+	for page in pages:
+		e.feed(r.frame(page))
+		test/e.grid == naive(s, page)
+		test/[x.cellcount() for x in r.shadow[:len(page)]] == [min(x.cellcount(), 10) for x in page]
+
+	test/e.text() == ['\u241b' * 10, 'ab' + ' ' * 8]
+
+if __name__ == '__main__':
+	import sys; from ...test import library as libtest
+	libtest.execute(sys.modules[__name__])
@@ -0,0 +1,370 @@
+"""
+# - &.frame
+"""
+from .. import core
+from .. import matrix
+from .. import frame as module
+
+normal = core.RenderParameters((-1024, -1024, core.NoTraits))
+red = core.RenderParameters((-513, -1024, core.NoTraits))
+
+def phrase(*words):
+	return core.Phrase(
+		(len(t), t, rp) for t, rp in words
+	)
+
+def screen(width=20, height=4):
+	s = matrix.Screen()
+	s.context_set_dimensions((width, height))
+	return s
+
+def test_prefix(test):
+	"""
+	# - &module.prefix
+	"""
+	a = phrase(("prefix", normal), ("-suffix", red))
+	test/module.prefix(a, a) == (13, (2, 0))
+	test/module.prefix(a, phrase(("prefix", normal), ("-other", red))) == (7, (1, 1))
+	test/module.prefix(a, phrase(("prefix", normal), ("-suffix", normal))) == (6, (1, 0))
+	test/module.prefix(a, phrase(("pre", normal))) == (3, (0, 3))
+	test/module.prefix(phrase(), a) == (0, (0, 0))
+
+	# Combining characters are redrawn with their base.
+	test/module.prefix(phrase(("ca\u0301", normal)), phrase(("ca\u0300", normal))) == (1, (0, 1))
+
+def test_suffix(test):
+	"""
+	# - &module.suffix
+	"""
+	a = phrase(("prefix", normal), ("-suffix", red))
+	test/module.suffix(a, phrase(("prefiz", normal), ("-suffix", red)), 13) == (7, (1, 0))
+	test/module.suffix(a, phrase(("prefix", normal), ("_suffix", red)), 13) == (6, (1, 1))
+	test/module.suffix(a, phrase(("prefix", normal), ("_suffix", red)), 4) == (4, (1, 3))
+	test/module.suffix(a, phrase(("prefix", normal), ("-suffix", normal)), 13) == (0, (2, 0))
+
+def test_segment(test):
+	"""
+	# - &module.segment
+	"""
+	a = phrase(("prefix", normal), ("-", red), ("suffix", normal))
+	test/list(module.segment(a, (0, 3), (2, 2))) == [(3, "fix", normal), a[1], (2, "su", normal)]
+	test/list(module.segment(a, (0, 3), (0, 5))) == [(2, "fi", normal)]
+	test/list(module.segment(a, (1, 0), (3, 0))) == [a[1], a[2]]
+	test/list(module.segment(a, (3, 0), (3, 0))) == []
+
+def test_Renderer_initial(test):
+	"""
+	# - &module.Renderer.frame
+	"""
+	s = screen()
+	r = module.Renderer(s)
+	page = [phrase(("first", normal)), phrase(("second", red))]
+
+	out = r.frame(page)
+	test/out.startswith(s.clear()) == True
+	b'first' in test/out
+	b'second' in test/out
+	test/len(r.shadow) == 4
+
+	# No changes, no output.
+	test/r.frame(page) == b''
+	test/r.frame(list(page)) == b''
+
+	r.invalidate()
+	test/r.frame(page).startswith(s.clear()) == True
+
+def test_Renderer_damage(test):
+	"""
+	# - &module.Renderer.frame
+	# - &module.Renderer.line
+	"""
+	s = screen()
+	r = module.Renderer(s)
+	r.frame([phrase(("counter: ", normal), ("100", red)), phrase(("static", normal))])
+
+	# Single cell change; same width.
+	out = r.frame([phrase(("counter: ", normal), ("101", red)), phrase(("static", normal))])
+	test/out == s.seek_absolute((11, 0)) + b'\x1b[31m1'
+
+	# Shorter line; erase the remainder in the normal parameters.
+	out = r.frame([phrase(("counter: ", normal), ("1", red)), phrase(("static", normal))])
+	test/out == s.seek_absolute((10, 0)) + b'\x1b[39m' + b'  '
+
+	# Cleared line.
+	out = r.frame([phrase(("counter: ", normal), ("1", red))])
+	test/out == s.seek_absolute((0, 1)) + s.clear_after_cursor()
+
+def test_Renderer_motion(test):
+	"""
+	# - &module.Renderer.line
+
+	# Validate that the motions between the lines of a frame are relative to the cursor.
+	"""
+	s = screen()
+	r = module.Renderer(s)
+	r.frame([phrase(("counter: ", normal), ("100", red)), phrase(("counter: ", normal), ("200", red))])
+
+	out = r.frame([phrase(("counter: ", normal), ("101", red)), phrase(("counter: ", normal), ("201", red))])
+	test/out == s.seek_absolute((11, 0)) + b'1' + b'\x1b[B\x08' + b'1'
+	test/r.cursor == None
+
+def test_overwrite(test):
+	"""
+	# - &module.overwrite
+	"""
+	p = phrase(("ab", normal), ("謝c", red), ("de", red))
+	test/module.overwrite(p, (2, 1), 4, red) == "謝cd"
+	test/module.overwrite(p, (3, 0), 2, red) == "de"
+	test/module.overwrite(p, (1, 1), 2, red) == "謝"
+
+	# Torn wide characters and other render parameters.
+	test/module.overwrite(p, (1, 1), 1, red) == None
+	test/module.overwrite(p, (2, 1), 3, red) == None
+	test/module.overwrite(p, (1, 1), 3, red) == None
+	test/module.overwrite(p, (0, 1), 2, normal) == None
+
+def test_Renderer_overwrite(test):
+	"""
+	# - &module.update
+
+	# Validate that the cells before a change are overwritten when shorter than a motion.
+	"""
+	s = screen()
+	r = module.Renderer(s)
+	r.frame([phrase(("ab", normal), ("x", red), ("cdefgh", red)), phrase(("abc", normal), ("dey", red))])
+
+	out = r.frame([phrase(("ab", normal), ("X", red), ("cdefgh", red)), phrase(("abc", normal), ("deY", red))])
+	test/out == s.seek_absolute((2, 0)) + b'X' + b'\x1b[B' + b'de' + b'Y'
+
+def test_update_shift(test):
+	"""
+	# - &module.update
+
+	# Validate that insertions and deletions shift the unchanged tail.
+	"""
+	s = screen(width=40)
+	a = phrase(("hello world, and more", normal))
+	b = phrase(("hello, world, and more", normal))
+	c = phrase(("hello, wor", red), ("ld, and more", normal))
+
+	# Insertion.
+	buffer = bytearray()
+	rp, cursor = module.update(s, buffer, 0, a, 21, b, 22, normal)
+	test/bytes(buffer) == s.seek_absolute((5, 0)) + b'\x1b[1@' + b','
+	test/cursor == (6, 0)
+	test/rp == normal
+
+	# Deletion; the parameters are normalized before DCH.
+	buffer = bytearray()
+	rp, cursor = module.update(s, buffer, 0, b, 22, a, 21, red, (6, 0))
+	test/bytes(buffer) == b'\x08' + b'\x1b[39m' + b'\x1b[1P'
+	test/cursor == (5, 0)
+	test/rp == normal
+
+	# Not a pure insertion; the changed cells and the tail are redrawn.
+	buffer = bytearray()
+	rp, cursor = module.update(s, buffer, 0, a, 21, c, 22, normal)
+	test/bytes(buffer) == s.seek_absolute((0, 0)) + b'\x1b[31mhello, wor\x1b[39mld, and more'
+	test/cursor == (22, 0)
+
+	# Identical lines.
+	buffer = bytearray()
+	rp, cursor = module.update(s, buffer, 0, a, 21, a, 21, red, (3, 0))
+	test/bytes(buffer) == b''
+	test/rp == red
+	test/cursor == (3, 0)
+
+	# Short tails are redrawn.
+	buffer = bytearray()
+	rp, cursor = module.update(s, buffer, 0, phrase(("abc", normal)), 3, phrase(("abxc", normal)), 4, normal)
+	test/bytes(buffer) == s.seek_absolute((2, 0)) + b'xc'
+
+	# Areas not extending to the right edge are redrawn.
+	ctx = matrix.Context()
+	ctx.context_set_position((0, 0))
+	ctx.context_set_dimensions((40, 1))
+	buffer = bytearray()
+	rp, cursor = module.update(ctx, buffer, 0, b, 22, a, 21, normal)
+	test/bytes(buffer) == ctx.seek_absolute((5, 0)) + b' world, and more' + ctx.spaces(1)
+
+def test_Renderer_clip(test):
+	"""
+	# - &module.Renderer.frame
+
+	# Lines wider than the screen are truncated.
+	"""
+	s = screen(width=4, height=1)
+	r = module.Renderer(s)
+	r.frame([phrase(("truncated", normal))])
+	test/r.shadow[0].cellcount() == 4
+
+	# Truncated lines match the shadow.
+	s = screen(width=10, height=2)
+	r = module.Renderer(s)
+	page = [phrase(("0123456789abcdef", normal)), phrase(("short", red))]
+	test/r.frame(page) != b''
+	test/r.frame(page) == b''
+	test/r.frame(list(page)) == b''
+
+def test_Renderer_resize(test):
+	"""
+	# - &module.Renderer.frame
+
+	# Changing the dimensions of the screen redraws it.
+	"""
+	s = screen(width=10, height=2)
+	r = module.Renderer(s)
+	page = [phrase(("line", normal))]
+	r.frame(page)
+
+	s.context_set_dimensions((12, 2))
+	test/r.frame(page).startswith(s.clear()) == True
+	test/r.frame(page) == b''
+
+def test_shift(test):
+	"""
+	# - &module.shift
+	"""
+	lines = [phrase(("line %d" %(i,), normal)) for i in range(8)]
+	test/module.shift(lines, lines) == None
+	test/module.shift(lines, lines[1:]) == (1, 0, 6)
+	test/module.shift(lines, lines[3:] + lines[:1]) == (3, 0, 4)
+	test/module.shift(lines[1:], lines) == (-1, 1, 7)
+
+	# Empty lines do not vote.
+	blank = [phrase()] * 4
+	test/module.shift(blank, blank[1:]) == None
+
+def test_Renderer_scroll(test):
+	"""
+	# - &module.Renderer.scroll
+
+	# Validate that the shadow buffer is shifted and that only the exposed line is drawn.
+	"""
+	s = screen(height=4)
+	r = module.Renderer(s)
+	lines = [phrase(("line %d" %(i,), normal)) for i in range(5)]
+	r.frame(lines[:4])
+
+	out = r.frame(lines[1:5])
+	test/out == s.seek_absolute((0, 0)) + b'\x1b[1M' + s.seek_absolute((0, 3)) + b'line 4'
+	test/r.shadow == lines[1:5]
+
+	# Reverse; insert at top.
+	out = r.frame(lines[:4])
+	test/out == s.seek_absolute((0, 0)) + b'\x1b[1L' + s.seek_absolute((0, 0)) + b'line 0'
+	test/r.shadow == lines[:4]
+
+def test_Renderer_scroll_wide(test):
+	"""
+	# - &module.Renderer.scroll
+
+	# Validate that shifts of lines wider than the screen are detected.
+	"""
+	s = screen(width=20, height=6)
+	r = module.Renderer(s)
+	lines = [phrase(("%02d " %(i,) + "x" * 27, normal)) for i in range(7)]
+	r.frame(lines[:6])
+
+	out = r.frame(lines[1:7])
+	test/out == s.seek_absolute((0, 0)) + b'\x1b[1M' + s.seek_absolute((0, 5)) + b'06 ' + b'x' * 17
+
+def test_Renderer_scroll_region(test):
+	"""
+	# - &module.Renderer.scroll
+
+	# Validate that a scrolling region is used when the last line is not part of the shift.
+	"""
+	s = screen(height=5)
+	r = module.Renderer(s)
+	status = phrase(("status", red))
+	lines = [phrase(("line %d" %(i,), normal)) for i in range(6)]
+	r.frame(lines[:4] + [status])
+
+	out = r.frame(lines[2:6] + [status])
+	# Transition to normal from the status line's parameters precedes the scroll.
+	scroll = b'\x1b[39m' + s.set_scrolling_region(0, 3) + s.scroll_up(2) + s.reset_scrolling_region()
+	test/out.startswith(scroll) == True
+	test/r.shadow == lines[2:6] + [status]
+
+def test_Renderer_synchronized(test):
+	"""
+	# - &module.Renderer.frame
+
+	# Validate that frames are framed when the screen is synchronized.
+	"""
+	s = screen()
+	s.context_set_synchronized(True)
+	r = module.Renderer(s)
+
+	page = [phrase(("first", normal))]
+	out = r.frame(page)
+	test/out.startswith(s.begin_synchronized_update()) == True
+	test/out.endswith(s.end_synchronized_update()) == True
+	test/r.frame(page) == b''
+
+class Clock(object):
+	def __init__(self):
+		self.time = 100.0
+
+	def __call__(self):
+		return self.time
+
+def test_Scheduler(test):
+	"""
+	# - &module.Scheduler
+
+	# Validate that requests are coalesced and frames are limited by the rate.
+	"""
+	clock = Clock()
+	frames = []
+	def render(regions):
+		frames.append(regions)
+		return b'frame'
+
+	s = module.Scheduler(render, rate=8, clock=clock)
+	test/s.delay() == None
+	test/s.flush() == None
+
+	# Immediate after idle.
+	s.damage((0, 0))
+	test/s.pending == True
+	test/s.delay() == 0.0
+	test/s.flush() == b'frame'
+	test/frames[-1] == {(0, 0)}
+	test/s.pending == False
+
+	# Coalesced while waiting.
+	clock.time += 0.03125
+	s.damage((0, 1))
+	s.damage((0, 1))
+	s.damage(None)
+	test/s.delay() == 0.09375
+	test/s.flush() == None
+	test/len(frames) == 1
+
+	clock.time += 0.09375
+	test/s.delay() == 0.0
+	test/s.flush() == b'frame'
+	test/frames[-1] == {(0, 1), None}
+
+	# Forced.
+	s.damage()
+	test/s.flush() == None
+	test/s.flush(force=True) == b'frame'
+
+	# Idle period; immediate again.
+	clock.time += 5
+	s.damage()
+	test/s.delay() == 0.0
+
+	info = s.info()
+	test/info.frames == 3
+	test/info.requests == 6
+	test/info.bytes == 15
+	test/info.render_maximum == 0.0
+	test/info.interval == 0.0625
+
+if __name__ == '__main__':
+	import sys; from ...test import library as libtest
+	libtest.execute(sys.modules[__name__])
@@ -0,0 +1,124 @@
+"""
+# - &.layout
+"""
+from .. import core
+from .. import matrix
+from .. import layout as module
+
+rp = core.RenderParameters((-1024, -1024, core.NoTraits))
+red = core.RenderParameters((-513, -1024, core.NoTraits))
+
+def phrase(string, rp=rp):
+	return core.Phrase(rp.form(string))
+
+def test_Columns_widths(test):
+	"""
+	# - &module.Columns.load
+	# - &module.Columns.width
+	# - &module.Columns.update
+	# - &module.Columns.delete
+	"""
+	c = module.Columns(['left', 'right'])
+	c.load([
+		[phrase("a"), phrase("1")],
+		[phrase("abc"), phrase("12345")],
+		[phrase("ab")],
+	])
+	test/c.widths() == [3, 5]
+	test/c.cellcount() == 9
+
+	c.update(1, 1, phrase("1"))
+	test/c.widths() == [3, 1]
+	c.update(0, 0, phrase("abcd"))
+	test/c.widths() == [4, 1]
+
+	c.delete(0)
+	test/c.widths() == [3, 1]
+	c.set_width(0, 2)
+	test/c.widths() == [2, 1]
+	c.set_width(0, None)
+	test/c.widths() == [3, 1]
+
+	test/ValueError ^ (lambda: c.insert(0, [phrase("x")] * 3))
+
+def test_Columns_render(test):
+	"""
+	# - &module.Columns.render
+	"""
+	ctx = matrix.Context()
+	c = module.Columns(['left', 'right', 'center'])
+	c.load([
+		[phrase("a"), phrase("1"), phrase("x")],
+		[phrase("abcd"), phrase("123", red), phrase("xyz")],
+	])
+
+	# "a" + (3 + 1 + 2) blanks + "1" + (1 + 1) blanks + "x"
+	row = b''.join(c.render(ctx, 0))
+	test/row == b'a' + ctx.spaces(6) + b'1' + ctx.spaces(2) + b'x'
+
+	row = b''.join(c.render(ctx, 1))
+	test/row == b'abcd' + ctx.spaces(1) + b'\x1b[31m123\x1b[39m' + ctx.spaces(1) + b'xyz'
+
+	# Truncation by fixed width.
+	c.set_width(0, 2)
+	row = b''.join(c.render(ctx, 1))
+	test/row.startswith('a…'.encode('utf-8')) == True
+
+def test_Columns_print(test):
+	"""
+	# - &module.Columns.print
+	"""
+	ctx = matrix.Context()
+	ctx.context_set_position((0, 0))
+	ctx.context_set_dimensions((10, 2))
+	ctx.seek((0, 0))
+
+	c = module.Columns(['left', 'left'])
+	c.load([
+		[phrase("ab"), phrase("1")],
+		[phrase("a"), phrase("")],
+	])
+	out = list(c.print(ctx))
+	test/out[0] == ctx.reset_text()
+	test/out[1] == b'ab' + ctx.spaces(1) + b'1'
+	test/out[2] == ctx.erase(6)
+	# Trailing blanks are left to the erase.
+	test/out[4] == b'a'
+	test/out[5] == ctx.erase(9)
+
+def test_Columns_print_overflow(test):
+	"""
+	# - &module.Columns.print
+
+	# Validate that rows wider than the context are truncated.
+	"""
+	ctx = matrix.Context()
+	ctx.context_set_position((0, 0))
+	ctx.context_set_dimensions((10, 3))
+	ctx.seek((0, 0))
+
+	# Columns at 0, 7, and 13.
+	c = module.Columns(['left', 'right', 'left'])
+	c.load([
+		[phrase("abcde"), phrase("1", red), phrase("x")],
+		[phrase("a"), phrase("12345", red), phrase("x")],
+		[phrase("abcdef"), phrase("1謝2", red), phrase("x")],
+	])
+	out = list(c.print(ctx))
+	red1 = b''.join(ctx.render(core.Phrase(red.form("1"))))
+	back = ctx._transition(red, rp)
+
+	# Columns beyond the width are not rendered.
+	test/out[1] == b'abcde'
+	test/out[2] == ctx.erase(5)
+
+	# Columns crossing the width are truncated and the line is not erased.
+	test/out[4] == b'a' + ctx.spaces(6) + red1 + b'23' + back
+
+	# Torn wide characters are substituted.
+	test/out[6] == b'abcdef' + ctx.spaces(2) + red1 + b' ' + back
+	test/len(out) == 8
+
+if __name__ == '__main__':
+	import sys; from ...test import library as libtest
+	libtest.execute(sys.modules[__name__])
@@ -160,6 +160,458 @@ def test_Context_draw_words(test):
 	ctx = module.Context()
 	b'test' in test/ctx.draw_words("test")
 
+def test_Type_control_sanitization(test):
+	"""
+	# - &module.Type.encode_words
+	# - &module.cells
+	"""
+	t = module.Type('utf-8')
+	test/t.encode_words("a\x1b[2Jb") == "a\u241b[2Jb".encode('utf-8')
+	test/t.encode_words("\x00\x7f\x85") == "\u2400\u2421\u2426".encode('utf-8')
+	test/t.encode_words("\x1b") == "\u241b".encode('utf-8')
+	info = t.cache_info()['word-encode']
+	test/info.currsize == 3
+	test/info.hits == 0
+
+	# Printable text is not translated.
+	test/t.encode_words("plain") == b'plain'
+	test/t.cache_info()['word-encode'].currsize == 3
+
+	# Replacement glyphs occupy a cell.
+	test/module.cells("abc") == 3
+	test/module.cells("a\x1bb") == 3
+	test/module.cells("\t\x9b") == 2
+	test/module.cells(core.Units(("\x07",))) == 1
+
+	ctx = module.Context(t)
+	ctx.context_set_dimensions((10, 1))
+	ph = core.Phrase.construct([("x\x1b[31m", -1024, -1024, core.NoTraits)], cells=module.cells)
+	test/ph.cellcount() == 6
+	test/b''.join(ctx.render(ph)).endswith("x\u241b[31m".encode('utf-8')) == True
+
+	# Custom maps are applied before the replacement.
+	test/ctx.draw_words("a\tb", str.maketrans({'\t': ' '})) == b'a b'
+	test/ctx.draw_words("a\tb") == "a\u2409b".encode('utf-8')
+
+def test_Type_replicate(test):
+	"""
+	# - &module.Type.replicate
+	"""
+	t = module.Type('utf-8', integer_encode_cache_size=8)
+	r = t.replicate()
+	test/r != t
+	test/r.encoding == t.encoding
+	test/r.errors == t.errors
+
+	# Independent caches.
+	t.cached_words_encode('word')
+	test/t.cache_info()['word-encode'].currsize == 1
+	test/r.cache_info()['word-encode'].currsize == 0
+	test/(r.integers is t.integers) == False
+
+def test_Type_encode_words(test):
+	"""
+	# - &module.Type.encode_words
+	"""
+	t = module.Type('utf-8')
+	test/t.encode_words("text") == b'text'
+	test/t.cache_info()['word-encode'].currsize == 0
+
+	# Text outside of ASCII is cached.
+	test/t.encode_words("謝了") == "謝了".encode('utf-8')
+	test/t.encode_words("謝了") == "謝了".encode('utf-8')
+	info = t.cache_info()['word-encode']
+	test/info.currsize == 1
+	test/info.hits == 1
+
+	test/t.encode_words(core.Units(("a", "́"))) == "á".encode('utf-8')
+	test/t.encode_words("\udcff") == b'\xff'
+
+	# Encodings that are not supersets of ASCII always use the cache.
+	t = module.Type('utf-16-le')
+	test/t.encode_words("ab") == "ab".encode('utf-16-le')
+	test/t.cache_info()['word-encode'].currsize == 1
+
+	# Rendering encodes through the instance.
+	ctx = module.Context(module.Type('utf-8'))
+	ctx.context_set_dimensions((10, 1))
+	ph = core.Phrase.construct([("謝", -1024, -1024, core.NoTraits), ("x", -1024, -1024, core.NoTraits)])
+	test/b''.join(ctx.render(ph)).endswith("謝x".encode('utf-8')) == True
+	test/ctx.terminal_type.cache_info()['word-encode'].currsize == 1
+
+def test_Type_local(test):
+	"""
+	# - &module.Type.local
+	"""
+	import threading
+	t = module.Type('utf-8')
+	local = t.local()
+	test/local != t
+	test/t.local() == local
+
+	other = []
+	th = threading.Thread(target=(lambda: other.append(t.local())))
+	th.start()
+	th.join()
+	test/other[0] != local
+	test/other[0].encoding == 'utf-8'
+
+def test_Context_render_threads(test):
+	"""
+	# - &module.Context.render
+	# - &module.Type.local
+
+	# Validate that contexts rendering concurrently produce the same output as serial rendering.
+	"""
+	from concurrent.futures import ThreadPoolExecutor
+	t = module.Type('utf-8')
+	styles = [
+		(x, -1024, core.Traits.construct('bold') if x % 2 else core.NoTraits)
+		for x in range(24)
+	]
+	pages = [
+		[
+			core.Phrase.construct([
+				("word-%d-%d" %(p, l), *styles[(p + l) % len(styles)]),
+				(" ", -1024, -1024, core.NoTraits),
+				("following", *styles[(p * l) % len(styles)]),
+			])
+			for l in range(32)
+		]
+		for p in range(16)
+	]
+
+	def draw(page):
+		ctx = module.Context(t.local())
+		ctx.context_set_position((0, 0))
+		ctx.context_set_dimensions((80, 32))
+		return b''.join(ctx.print(page, [x.cellcount() for x in page]))
+
+	expected = list(map(draw, pages))
+	with ThreadPoolExecutor(4) as tp:
+		test/list(tp.map(draw, pages)) == expected
+
+def test_Context_render_into(test):
+	"""
+	# - &module.Context.render_into
+	"""
+	s = module.Screen()
+	ph = core.Phrase.construct([
+		("Simple", -1024, -1024, s.Traits.construct('underline')),
+		(" ", -1024, -1024, s.Traits.construct('bold')),
+		("phrase.", -513, -1024, s.Traits.construct('bold')),
+	])
+
+	buffer = bytearray(b'prefix')
+	last = s.render_into(buffer, ph)
+	test/bytes(buffer) == b'prefix' + b''.join(s.render(ph))
+	test/last == ph[-1][2]
+
+	# Continuation.
+	following = bytearray()
+	test/s.render_into(following, ph, last) == last
+	test/bytes(following) == b''.join(s.render(ph, last))
+
+	# Empty phrase.
+	test/s.render_into(bytearray(), ()) == s.context_render_parameters
+
+def test_Context_print_into(test):
+	"""
+	# - &module.Context.print_into
+	"""
+	ctx = module.Context()
+	ctx.context_set_position((0, 0))
+	ctx.context_set_dimensions((8, 3))
+	page = [
+		core.Phrase.construct([("first", -513, -1024, core.NoTraits)]),
+		core.Phrase.construct([("exceeding width", -1024, -1024, core.NoTraits)]),
+	]
+	cc = [x.cellcount() for x in page]
+
+	ctx.seek((0, 0))
+	expected = b''.join(ctx.print(page, cc, [0, 1]))
+
+	ctx.seek((0, 0))
+	buffer = bytearray()
+	test/ctx.print_into(buffer, page, cc, [0, 1]) == ctx.context_render_parameters
+	test/bytes(buffer) == expected
+
+def test_Screen_synchronize(test):
+	"""
+	# - &module.Screen.synchronize
+	# - &module.Screen.begin_synchronized_update
+	# - &module.Screen.end_synchronized_update
+	# - &module.Type.decrqm
+	"""
+	S = module.Screen()
+	test/S.begin_synchronized_update() == b'\x1b[?2026h'
+	test/S.end_synchronized_update() == b'\x1b[?2026l'
+	test/S.terminal_type.decrqm(2026) == b'\x1b[?2026$p'
+
+	test/S.synchronized == False
+	test/S.synchronize(b'frame') == b'frame'
+
+	test/S.context_set_synchronized(True) == S
+	test/S.synchronize(b'frame') == b'\x1b[?2026hframe\x1b[?2026l'
+	test/S.synchronize(b'') == b''
+
+def test_Transitions(test):
+	"""
+	# - &module.Transitions
+	"""
+	t = module.Type('utf-8', transition_cache_size=2)
+	table = t.cached_transition
+	notraits = core.NoTraits
+	a = core.RenderParameters((-1024, -1024, notraits))
+	b = core.RenderParameters((-513, -1024, notraits))
+	c = core.RenderParameters((-513, -1024, core.Traits.construct('bold')))
+
+	test/table(a, b) == t.transition_render_parameters(a, b)
+	test/table(a, b) == b'\x1b[31m'
+	test/table.info() == (1, 1, 2, 1)
+
+	# Identity of the interned parameters.
+	test/(table.intern(core.RenderParameters(a)) is a) == True
+
+	table(b, c)
+	test/len(table) == 2
+	test/table.evictions == 0
+
+	# Limit reached; cleared before insertion.
+	test/table(c, a) == t.transition_render_parameters(c, a)
+	test/len(table) == 1
+	test/table.evictions == 1
+	test/table.info() == (1, 3, 2, 1)
+	test/table.rate() == 0.25
+
+	table.clear()
+	test/len(table) == 0
+
+def test_Type_caches(test):
+	"""
+	# - &module.Type.cache_info
+	# - &module.Type.clear_caches
+	# - &module.Type.warm_cache
+	"""
+	t = module.Type('utf-8', integer_encode_cache_size=64, word_encode_cache_size=8, transition_cache_size=4)
+	info = t.cache_info()
+	test/set(info) == {'integer-encode', 'word-encode', 'transition'}
+	test/info['integer-encode'].maxsize == 64
+	test/info['word-encode'].maxsize == 8
+	test/info['transition'].maxsize == 4
+
+	t.warm_cache('integer-encode', range(1000, 1010))
+	test/t.cache_info()['integer-encode'].currsize == 10
+	t.cached_integer_encode(1001)
+	test/t.cache_info()['integer-encode'].hits == 1
+
+	a = core.RenderParameters((-1024, -1024, core.NoTraits))
+	b = core.RenderParameters((-513, -1024, core.NoTraits))
+	t.warm_cache('transition', [(a, b), (b, a)])
+	test/t.cache_info()['transition'].currsize == 2
+
+	integers = t.cache_info()['integer-encode'].currsize
+	t.clear_caches('transition')
+	test/t.cache_info()['transition'].currsize == 0
+	test/t.cache_info()['integer-encode'].currsize == integers
+
+	t.clear_caches()
+	test/t.cache_info()['integer-encode'].currsize == 0
+
+	# Replicas share the configuration.
+	test/t.replicate().cache_info()['word-encode'].maxsize == 8
+
+def test_Integers(test):
+	"""
+	# - &module.Integers
+	# - &module.Type.reserve_integers
+	"""
+	t = module.Type('utf-8', integer_table_size=16)
+	test/t.integers.limit == 16
+	test/t.cached_integer_encode(15) == b'15'
+	test/t.cache_info()['integer-encode'].misses == 0
+
+	# Overflow.
+	test/t.cached_integer_encode(16) == b'16'
+	test/t.cache_info()['integer-encode'].misses == 1
+	test/t.cached_integer_encode(-1) == b'-1'
+	test/t.cache_info()['integer-encode'].misses == 2
+
+	# Reservation is never reduced.
+	t.reserve_integers(8)
+	test/t.integers.limit == 16
+
+	ctx = module.Context(t)
+	ctx.context_set_dimensions((120, 40))
+	test/t.integers.limit >= 121
+	test/ctx.seek_absolute((119, 39)) == b'\x1b[40;120H'
+	test/t.cache_info()['integer-encode'].misses == 2
+
+	# Replicas inherit the reserved size.
+	test/t.replicate().integers.limit == t.integers.limit
+
+	# Clearing leaves the table.
+	t.clear_caches()
+	test/t.cache_info()['integer-encode'].currsize == 0
+	test/len(t.integers) == t.integers.limit
+	t.cached_integer_encode(-1)
+	t.integers.clear_overflow()
+	test/t.cache_info()['integer-encode'].currsize == 0
+	test/t.cached_integer_encode(15) == b'15'
+	test/t.cached_integer_encode(100) == b'100'
+
+def test_Context_motion(test):
+	"""
+	# - &module.Context.motion
+	# - &module.Context.seek
+	"""
+	ctx = module.Context()
+	ctx.context_set_position((0, 0))
+	ctx.context_set_dimensions((80, 24))
+
+	test/ctx.motion((5, 5), (5, 5)) == b''
+	test/ctx.motion((5, 5), (6, 5)) == b'\x1b[C'
+	test/ctx.motion((5, 5), (4, 5)) == b'\x08'
+	test/ctx.motion((5, 5), (5, 4)) == b'\x1b[A'
+	test/ctx.motion((5, 5), (0, 6)) == b'\r\n'
+	test/ctx.motion((10, 5), (0, 5)) == b'\r'
+	test/ctx.motion((30, 5), (1, 5)) == b'\x1b[2G'
+	test/ctx.motion((5, 5), (40, 5)) == b'\x1b[35C'
+	test/ctx.motion((70, 5), (2, 5)) == b'\x1b[3G'
+	test/ctx.motion((70, 20), (0, 0)) == b'\x1b[H'
+	test/ctx.motion((70, 20), (0, 9)) == b'\x1b[10H'
+	test/ctx.motion((5, 5), (40, 20)) == b'\x1b[21;41H'
+	test/ctx.motion((5, 15), (5, 2)) == b'\x1b[3d'
+
+	# Overwriting known cells.
+	test/ctx.motion((5, 5), (8, 5), overwrite=b'abc') == b'abc'
+	test/ctx.motion((5, 5), (8, 6), overwrite=b'abc') == b'\x1b[7;9H'
+
+	# Carriage returns are not used when the area is not in the first column.
+	ctx.context_set_position((10, 2))
+	test/ctx.motion((3, 0), (0, 1)) == b'\x1b[B\x08\x08\x08'
+	test/ctx.motion((100, 0), (0, 0)) == b'\x1b[11G'
+
+	# Absolute when the origin is unknown.
+	test/ctx.seek((1, 1)) == ctx.seek_absolute((11, 3))
+	test/ctx.seek((2, 1), (1, 1)) == b'\x1b[C'
+	test/ctx.tell() == (2, 1)
+
+def test_Context_blank(test):
+	"""
+	# - &module.Context.spaces
+	# - &module.Context.blank
+	"""
+	ctx = module.Context()
+	ctx.context_set_position((0, 0))
+	ctx.context_set_dimensions((80, 24))
+	normal = ctx._context_traits
+	underline = normal.apply('underline')
+
+	test/ctx.spaces(0) == b''
+	test/ctx.spaces(1) == b' '
+	test/ctx.spaces(4) == b'    '
+	test/ctx.spaces(12) == b' \x1b[11b'
+
+	test/ctx.blank(0, normal) == (b'', 0)
+	test/ctx.blank(2, normal) == (b'  ', 2)
+	test/ctx.blank(1, underline) == (b'\x1b[X', 0)
+	test/ctx.blank(12, normal) == (b'\x1b[12X', 0)
+	test/ctx.blank(100, normal) == (b'\x1b[100X', 0)
+
+	# EL requires the area to reach the right edge.
+	test/ctx.blank(12, normal, True) == (b'\x1b[12X', 0)
+	ctx.context_set_right_edge(True)
+	test/ctx.blank(12, normal, True) == (b'\x1b[K', 0)
+	test/ctx.blank(2, normal, True) == (b'  ', 2)
+	test/ctx.blank(2, underline, True) == (b'\x1b[K', 0)
+
+def test_Type_color_depth(test):
+	"""
+	# - &module.Type.degrade_color
+	# - &module.Type.select_degraded_color
+	# - &module.Type.select_degraded_transition
+	"""
+	native = module.Type('utf-8')
+	test/native.select_color(True, 0xff0000) == (b'38;2', b'255;0;0')
+
+	t256 = module.Type('utf-8', color_depth='xterm-256')
+	test/t256.select_color(True, 0xff0000) == (b'38;5', b'196')
+	test/t256.select_color(False, -197) == (b'48;5', b'196')
+	test/t256.select_color(True, -513) == (b'31',)
+
+	t16 = module.Type('utf-8', color_depth='tty-16')
+	test/t16.select_color(True, 0xff0000) == (b'91',)
+	test/t16.select_color(False, -197) == (b'101',)
+	test/t16.select_color(True, -1024) == (b'39',)
+
+	mono = module.Type('utf-8', color_depth='mono')
+	test/mono.select_color(True, 0xff0000) == (b'39',)
+	test/mono.select_color(False, -513) == (b'49',)
+
+	# Transitions use the degraded selections.
+	rp = core.RenderParameters((0xff0000, -1024, core.NoTraits))
+	normal = core.RenderParameters((-1024, -1024, core.NoTraits))
+	test/t16.cached_transition(normal, rp) == b'\x1b[91m'
+
+	# Colors degrading to the same code do not emit a selection.
+	red = core.RenderParameters((0xfe0000, -1024, core.NoTraits))
+	green = core.RenderParameters((0x00ff00, -1024, core.NoTraits))
+	test/t256.cached_transition(normal, rp) == b'\x1b[38;5;196m'
+	test/t256.cached_transition(rp, red) == b''
+	test/mono.cached_transition(normal, rp) == b''
+	test/mono.cached_transition(rp, green) == b''
+	test/mono.transition_render_parameters((None, None, core.NoTraits), green) == b'\x1b[39;49m'
+
+	# Cached per color and carried by replicas.
+	test/(t16.select_color(True, 0xff0000) is t16.select_color(True, 0xff0000)) == True
+	test/t16.replicate().color_depth == 'tty-16'
+
+	test/ValueError ^ (lambda: module.Type('utf-8', color_depth='8'))
+
+def test_Type_constant_sequences(test):
+	"""
+	# - &module.Type.constant_sequences
+	# - &module.Type.compile_sequences
+	"""
+	t = module.Type('utf-8')
+	test/t.clear_screen == b'\x1b[2J'
+	test/t.clear_before_cursor == b'\x1b[1K'
+	test/t.hide_cursor == b'\x1b[?25l'
+	test/t.begin_synchronized_update == b'\x1b[?2026h'
+	test/t.erase_character == b'\x1b[X'
+	test/t.cursor_backward == b'\x1b[D'
+
+	# Methods without parameters return the compiled instances.
+	s = module.Screen(t)
+	test/(s.store_cursor_location() is t.store_cursor) == True
+	test/(s.set_cursor_visible(False) is t.hide_cursor) == True
+	test/(s.begin_synchronized_update() is t.begin_synchronized_update) == True
+	test/s.clear() == s.reset_text() + b'\x1b[H\x1b[2J'
+	test/s.exit_scrolling_region() == b'\x1b[s\x1b[?6l'
+
+	# Profiles override entries.
+	class Profile(module.Type):
+		constant_sequences = dict(module.Type.constant_sequences)
+		constant_sequences['clear_screen'] = ('csi', b'3J')
+
+	p = Profile('utf-8')
+	test/p.clear_screen == b'\x1b[3J'
+	test/p.replicate().clear_screen == b'\x1b[3J'
+	test/module.Screen(p).clear().endswith(b'\x1b[3J') == True
+
+	# Contexts select the compiled instances.
+	class Profile(module.Type):
+		constant_sequences = dict(module.Type.constant_sequences)
+		constant_sequences['cursor_forward'] = ('csi', b'C', b'1')
+		constant_sequences['erase_character'] = ('csi', b'X', b'1')
+
+	ctx = module.Context(Profile('utf-8'))
+	ctx.context_set_position((0, 0))
+	ctx.context_set_dimensions((20, 10))
+	test/ctx.motion((4, 4), (5, 4)) == b'\x1b[1C'
+	test/ctx.blank(1, core.RenderParameters((-1024, -1024, core.Traits(1))))[0] == b'\x1b[1X'
+
 if __name__ == '__main__':
 	import sys; from ...test import library as libtest
 	libtest.execute(sys.modules[__name__])
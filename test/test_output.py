@@ -0,0 +1,209 @@
+"""
+# - &.output
+"""
+import os
+from .. import output as module
+
+def pipe():
+	r, w = os.pipe()
+	return r, w
+
+def drain(fd, size):
+	data = b''
+	while len(data) < size:
+		data += os.read(fd, size - len(data))
+	return data
+
+def test_Sink_flush(test):
+	"""
+	# - &module.Sink.write
+	# - &module.Sink.extend
+	# - &module.Sink.flush
+	"""
+	r, w = pipe()
+	try:
+		s = module.Sink(w)
+		s.write(b'first')
+		s.write(b'')
+		s.extend([b'-', b'second', b''])
+		test/len(s) == 12
+
+		test/s.flush() == (12, 1)
+		test/len(s) == 0
+		test/drain(r, 12) == b'first-second'
+
+		# Empty flush.
+		test/s.flush() == (0, 0)
+		test/s.total == (12, 1)
+	finally:
+		os.close(r)
+		os.close(w)
+
+def test_Sink_batch(test):
+	"""
+	# - &module.Sink.flush
+
+	# Validate that the number of buffers per system call is limited by &module.Sink.batch.
+	"""
+	r, w = pipe()
+	try:
+		s = module.Sink(w, batch=2)
+		s.extend([b'a', b'b', b'c', b'd', b'e'])
+		test/s.flush(limit=2) == (4, 2)
+		test/len(s) == 1
+		test/s.flush() == (1, 1)
+		test/drain(r, 5) == b'abcde'
+		test/s.total == (5, 3)
+	finally:
+		os.close(r)
+		os.close(w)
+
+def test_Sink_partial(test):
+	"""
+	# - &module.Sink.flush
+
+	# Validate that partial writes to non-blocking descriptors are resumed.
+	"""
+	r, w = pipe()
+	try:
+		os.set_blocking(w, False)
+		s = module.Sink(w, timeout=0)
+		data = bytes(range(256)) * 1024 # Exceeds common pipe capacities.
+		s.write(data[:1000])
+		s.write(data[1000:])
+
+		written, calls = s.flush()
+		test/written < len(data)
+		test/len(s) == len(data) - written
+
+		received = drain(r, written)
+		while len(s):
+			n, calls = s.flush()
+			received += drain(r, n)
+
+		test/received == data
+	finally:
+		os.close(r)
+		os.close(w)
+
+def test_Sink_discard(test):
+	"""
+	# - &module.Sink.discard
+	"""
+	s = module.Sink(-1)
+	s.write(b'data')
+	test/len(s.discard()) == 0
+	test/s.flush() == (0, 0)
+
+def test_AsyncSink(test):
+	"""
+	# - &module.AsyncSink
+
+	# Validate backpressure, merging, and superseding with a pipe that is not read.
+	"""
+	import asyncio
+	r, w = pipe()
+	os.set_blocking(r, False)
+
+	def read():
+		data = b''
+		while True:
+			try:
+				chunk = os.read(r, 0x10000)
+			except BlockingIOError:
+				return data
+			if not chunk:
+				return data
+			data += chunk
+
+	async def run():
+		loop = asyncio.get_running_loop()
+		s = module.AsyncSink(w, limit=1024)
+		test/os.get_blocking(w) == False
+
+		# Written immediately when the device is ready.
+		s.write(b'first')
+		test/s.buffered == 0
+		test/s.written == 5
+
+		# Saturate the pipe.
+		large = b'x' * 0x40000
+		s.write(large)
+		test/s.buffered > 0
+		test/s.congested == True
+		active = len(s._active)
+
+		# Merged, then dropped by a superseding frame.
+		s.write(b'stale-1')
+		s.write(b'stale-2')
+		test/s.buffered == active + 14
+		s.write(b'full', supersedes=True)
+		test/s.dropped == 14
+		test/s.buffered == active + 4
+
+		# Read while draining.
+		received = bytearray()
+		async def reader():
+			while s.buffered:
+				received.extend(read())
+				await asyncio.sleep(0)
+		task = loop.create_task(reader())
+		await asyncio.wait_for(s.drain(0), 5)
+		await task
+		received.extend(read())
+
+		test/bytes(received) == b'first' + large + b'full'
+		test/s.written == len(received)
+		test/s.peak >= 0x40000
+		test/s._registered == False
+
+		s.close()
+		test/os.get_blocking(w) == True
+
+	try:
+		asyncio.run(run())
+	finally:
+		os.close(r)
+		os.close(w)
+
+def test_AsyncSink_error(test):
+	"""
+	# - &module.AsyncSink
+
+	# Validate that write errors are raised by drain and subsequent writes rather than retried.
+	"""
+	import asyncio
+	r, w = pipe()
+
+	async def run():
+		s = module.AsyncSink(w)
+
+		# Saturate the pipe, then close the reading end while the frame is pending.
+		s.write(b'x' * 0x40000)
+		test/s._registered == True
+		pending = asyncio.ensure_future(s.drain(0))
+		await asyncio.sleep(0)
+		os.close(r)
+
+		await asyncio.wait([pending], timeout=5)
+		test/pending.done() == True
+		test/BrokenPipeError ^ pending.result
+
+		test/s._registered == False
+		test/s.buffered == 0
+		test/BrokenPipeError ^ (lambda: s.write(b'next'))
+
+		later = asyncio.ensure_future(s.drain(0))
+		await asyncio.wait([later], timeout=5)
+		test/BrokenPipeError ^ later.result
+
+		s.close()
+
+	try:
+		asyncio.run(run())
+	finally:
+		os.close(w)
+
+if __name__ == '__main__':
+	import sys; from ...test import library as libtest
+	libtest.execute(sys.modules[__name__])
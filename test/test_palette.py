@@ -13,6 +13,52 @@ def test_colors(test):
 	test/module.colors['terminal-default'] == -1024
 	test/module.colors['application-border'] != -1024
 
+def test_quantize(test):
+	"""
+	# - &module.xterm_rgb
+	# - &module.quantize_256
+	# - &module.quantize_16
+	# - &module.tty16_reduction
+	"""
+	test/module.xterm_rgb(1) == module.tty16_rgb[1]
+	test/module.xterm_rgb(196) == 0xff0000
+	test/module.xterm_rgb(232) == 0x080808
+
+	# Exact matches.
+	test/module.quantize_256(0xff0000) == 196
+	test/module.quantize_256(0x080808) == 232
+	test/module.quantize_16(0xffffff) == 15
+
+	# Approximations.
+	test/module.quantize_256(0xfe0101) == 196
+	test/module.quantize_16(0x101010) == 0
+	test/module.quantize_16(0xd00000) == 1
+
+	test/len(module.tty16_reduction) == 256
+	test/module.tty16_reduction[:16] == tuple(range(16))
+	test/module.tty16_reduction[196] == 9
+
+def test_quantize_256_nearest(test):
+	"""
+	# - &module.quantize_256
+	# - &module.nearest
+
+	# Validate that the calculated selection is the closest code of the palette.
+	"""
+	# The boundaries between the cube's levels, and the gray ramp.
+	levels = [0, 47, 48, 75, 114, 115, 116, 154, 155, 156, 194, 195, 196, 234, 235, 236, 255]
+	for r in levels:
+		for g in levels[::2]:
+			for b in levels[::3]:
+				rgb = (r << 16) | (g << 8) | b
+				test/module.quantize_256(rgb) == module.nearest(rgb, range(16, 256))
+
+	for v in range(256):
+		rgb = (v << 16) | (v << 8) | v
+		test/module.quantize_256(rgb) == module.nearest(rgb, range(16, 256))
+		rgb = (v << 16) | (v << 8) | (255 - v)
+		test/module.quantize_256(rgb) == module.nearest(rgb, range(16, 256))
+
 if __name__ == '__main__':
 	import sys; from ...test import library as libtest
 	libtest.execute(sys.modules[__name__])
@@ -0,0 +1,120 @@
+"""
+# - &.shared
+"""
+import os
+import subprocess
+
+from .. import core
+from .. import matrix
+from .. import shared as module
+
+page = [
+	core.Phrase.construct([
+		("first", 0x00FF00, -1024, core.Traits.construct('bold')),
+		(" ", -1024, -1024, core.NoTraits),
+		("line", -513, -1024, core.NoTraits),
+	]),
+	core.Phrase.construct([]),
+	core.Phrase.construct([
+		("謝了春", -1024, -1024, core.NoTraits),
+		("\udcff", -1024, 0x000010, core.Traits.construct('underline', 'italic')),
+		(" ", -1024, -1024, core.NoTraits),
+	]),
+]
+
+def test_publish_attach(test):
+	"""
+	# - &module.publish
+	# - &module.attach
+	# - &module.SharedPage
+	"""
+	shm = module.publish(page)
+	try:
+		with module.attach(shm.name) as sp:
+			test/len(sp) == len(page)
+			test/list(sp) == page
+			test/sp[-1] == page[-1]
+			test/sp[0:2] == page[0:2]
+			test/IndexError ^ (lambda: sp[3])
+			test/list(sp.cellcounts()) == [x.cellcount() for x in page]
+
+			test.isinstance(sp[0], core.Phrase)
+			test.isinstance(sp[0][0][2].traits, core.Traits)
+			# Interned parameters.
+			test/(sp[0][1][2] is sp[2][0][2]) == True
+	finally:
+		shm.close()
+		shm.unlink()
+
+def test_SharedPage_print(test):
+	"""
+	# - &module.SharedPage.cellcounts
+	# - &matrix.Context.print
+	"""
+	ctx = matrix.Context()
+	ctx.context_set_position((0, 0))
+	ctx.context_set_dimensions((20, 3))
+	ctx.seek((0, 0))
+	expected = b''.join(ctx.print(page, [x.cellcount() for x in page]))
+
+	shm = module.publish(page)
+	try:
+		with module.attach(shm.name) as sp:
+			ctx.seek((0, 0))
+			test/b''.join(ctx.print(sp, sp.cellcounts())) == expected
+	finally:
+		shm.close()
+		shm.unlink()
+
+def test_SharedPage_none(test):
+	"""
+	# - &module.publish
+
+	# Validate that &None colors and traits survive the transfer.
+	"""
+	ph = [core.Phrase.construct([("default", None, None, None)])]
+	shm = module.publish(ph)
+	try:
+		with module.attach(shm.name) as sp:
+			test/list(sp) == ph
+	finally:
+		shm.close()
+		shm.unlink()
+
+def test_SharedPage_empty(test):
+	"""
+	# - &module.publish
+	"""
+	shm = module.publish([])
+	try:
+		with module.attach(shm.name) as sp:
+			test/len(sp) == 0
+			test/list(sp) == []
+	finally:
+		shm.close()
+		shm.unlink()
+
+def test_attach_process(test):
+	"""
+	# - &module.attach
+
+	# Validate that the segment survives the exit of a reading process.
+	"""
+	import sys
+	shm = module.publish(page)
+	try:
+		env = dict(os.environ)
+		env['PYTHONPATH'] = os.pathsep.join(sys.path)
+		code = "import sys; from %s import attach; attach(sys.argv[1]).close()" %(module.__name__,)
+		# Capturing stderr waits for the reader's resource tracker to exit as well.
+		subprocess.run([sys.executable, '-c', code, shm.name], env=env, check=True, stderr=subprocess.PIPE)
+
+		with module.attach(shm.name) as sp:
+			test/list(sp) == page
+	finally:
+		shm.close()
+		shm.unlink()
+
+if __name__ == '__main__':
+	import sys; from ...test import library as libtest
+	libtest.execute(sys.modules[__name__])